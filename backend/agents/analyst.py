@@ -3,12 +3,14 @@ Schema Analyst Agent - The Theorist.
 Infers API schemas from observed traffic and generates hypotheses.
 """
 
-import json
-import re
+import asyncio
+import hashlib
 from typing import Any
 from collections import defaultdict
+from functools import lru_cache
 
 from .base import BaseAgent
+from ..core.config import settings
 from ..core.state import AgentState
 from ..core.models import (
     Hypothesis,
@@ -16,6 +18,7 @@ from ..core.models import (
     EvidenceRef,
     CompetingExplanation,
 )
+from ..utils.json_codec import json_dumps, parse_json_body
 
 try:
     from genson import SchemaBuilder
@@ -24,6 +27,10 @@ except ImportError:
     GENSON_AVAILABLE = False
 
 
+# Hex digits (as byte values) for the fixed-shape UUID check
+_HEX = frozenset(b'0123456789abcdefABCDEF')
+
+
 # System prompt for schema enrichment
 SCHEMA_ENRICHMENT_PROMPT = """You are an API schema analyst. Your task is to analyze observed API responses and infer meaningful descriptions.
 
@@ -35,6 +42,169 @@ Given the endpoint pattern, inferred JSON schema, and sample responses, provide:
 
 Be specific and technical. If uncertain, say so."""
 
+# Schema for single-endpoint enrichment output
+ENRICHMENT_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "description": {"type": "string"},
+        "field_semantics": {"type": "object"},
+        "competing_explanations": {"type": "array", "items": {"type": "string"}}
+    }
+}
+
+# Schema for batched enrichment output (one entry per [index])
+BATCH_ENRICHMENT_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    **ENRICHMENT_OUTPUT_SCHEMA["properties"]
+                }
+            }
+        }
+    }
+}
+
+# Max endpoints per batched enrichment prompt
+ENRICHMENT_BATCH_SIZE = 8
+
+
+def _body_snippet(body: str | bytes | None, limit: int) -> str:
+    """
+    Truncate a body for prompts, slicing bytes before decoding them.
+    
+    Args:
+        body: Raw body as text or bytes
+        limit: Maximum length (characters for str, bytes for bytes)
+        
+    Returns:
+        Truncated body text
+    """
+    if not body:
+        return ""
+    if isinstance(body, str):
+        return body[:limit]
+    return bytes(body[:limit]).decode("utf-8", "replace")
+
+
+def _url_path(url: str) -> str:
+    """
+    Extract the path component of a URL without a full urlparse.
+    
+    Handles absolute (scheme://host/path), scheme-relative (//host/path)
+    and relative URLs; query string and fragment are dropped, and
+    ``;params`` on the last segment are cut the way urlparse does.
+    
+    Args:
+        url: Full or relative URL
+        
+    Returns:
+        URL path (empty string if the URL has no path)
+    """
+    end = len(url)
+    for sep in ('?', '#'):
+        k = url.find(sep, 0, end)
+        if k >= 0:
+            end = k
+    
+    i = url.find('://', 0, end)
+    if i >= 0:
+        start = url.find('/', i + 3, end)
+    elif url.startswith('//'):
+        start = url.find('/', 2, end)
+    else:
+        start = 0
+    if start < 0:
+        return ''
+    
+    # Strip ;params from the last segment (e.g. ;jsessionid=...)
+    k = url.find(';', max(url.rfind('/', start, end), start), end)
+    if k >= 0:
+        end = k
+    
+    return url[start:end]
+
+
+@lru_cache(maxsize=4096)
+def _url_to_pattern(url: str) -> str:
+    """
+    Convert URL to pattern by replacing dynamic segments.
+    Cached, since crawls revisit the same URLs many times.
+    
+    Args:
+        url: Full URL
+        
+    Returns:
+        URL pattern with placeholders
+    """
+    path = _url_path(url)
+    
+    # Split path into segments
+    segments = path.split('/')
+    pattern_segments = []
+    
+    for segment in segments:
+        if not segment:
+            continue
+        
+        # Check if segment is dynamic (UUID, number, etc.)
+        if _is_dynamic_segment(segment):
+            pattern_segments.append("{id}")
+        else:
+            pattern_segments.append(segment)
+    
+    return '/' + '/'.join(pattern_segments)
+
+
+def _is_dynamic_segment(segment: str) -> bool:
+    """
+    Check if a URL segment is dynamic (parameter).
+    
+    Args:
+        segment: URL path segment
+        
+    Returns:
+        True if segment is dynamic
+    """
+    # UUID pattern: 36 chars, hyphens at fixed offsets, hex elsewhere
+    if (
+        len(segment) == 36
+        and segment[8] == '-' and segment[13] == '-'
+        and segment[18] == '-' and segment[23] == '-'
+    ):
+        raw = segment.encode('ascii', 'ignore')
+        if (
+            len(raw) == 36
+            and raw.count(b'-') == 4
+            and all(c in _HEX for c in raw if c != 0x2d)
+        ):
+            return True
+    
+    # Numeric ID
+    if segment.isdigit():
+        return True
+    
+    # Alphanumeric ID (high entropy)
+    if len(segment) >= 8 and segment.isalnum():
+        # Check entropy - if mostly random chars, likely an ID.
+        # Count distinct chars in an int bitmap, stopping at the threshold.
+        threshold = len(segment) * 0.5
+        seen = 0
+        unique_chars = 0
+        for ch in segment:
+            bit = 1 << ord(ch)
+            if not seen & bit:
+                seen |= bit
+                unique_chars += 1
+                if unique_chars > threshold:
+                    return True
+    
+    return False
+
 
 class AnalystAgent(BaseAgent):
     """
@@ -51,8 +221,11 @@ class AnalystAgent(BaseAgent):
         """
         super().__init__(name="analyst", **kwargs)
         
-        # URL clustering state
-        self.url_clusters: dict[str, list[dict]] = defaultdict(list)
+        # Bounds concurrent enrichment calls to the LLM provider
+        self._llm_semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+        
+        # Pattern -> hypothesis ID, stable across execute() calls
+        self._pattern_ids: dict[str, str] = {}
     
     async def execute(self, state: AgentState) -> dict[str, Any]:
         """
@@ -75,20 +248,34 @@ class AnalystAgent(BaseAgent):
         
         self.log(f"Analyzing {len(observations)} observations")
         
+        # Parse each body once up front; schema inference reads the cached value
+        self._parse_bodies(observations)
+        
         # Cluster observations by URL pattern
         clusters = self._cluster_by_url(observations)
         
-        # Generate hypotheses for each cluster
-        hypotheses = []
+        # Infer schemas for every cluster first so enrichment can be batched
+        prepared = []
         
         for pattern, obs_group in clusters.items():
             try:
-                hypothesis = await self._generate_schema_hypothesis(pattern, obs_group)
-                if hypothesis:
-                    hypotheses.append(hypothesis)
+                cluster = self._prepare_cluster(pattern, obs_group)
+                if cluster:
+                    prepared.append(cluster)
             except Exception as e:
                 self.log(f"Error generating hypothesis for {pattern}: {e}")
         
+        # Batched enrichment, with batches issued concurrently
+        enrichments = await self._enrich_clusters(prepared)
+        
+        hypotheses = []
+        
+        for cluster, enrichment in zip(prepared, enrichments):
+            try:
+                hypotheses.append(self._assemble_hypothesis(cluster, enrichment))
+            except Exception as e:
+                self.log(f"Error generating hypothesis for {cluster['pattern']}: {e}")
+        
         self.log(f"Generated {len(hypotheses)} schema hypotheses")
         
         return {
@@ -98,6 +285,22 @@ class AnalystAgent(BaseAgent):
             )]
         }
     
+    def _parse_bodies(self, observations: list[dict[str, Any]]) -> None:
+        """
+        Parse request/response bodies once and cache them on each observation.
+        
+        Stored under "_parsed_request" / "_parsed_response" (None when the
+        body is missing or not JSON).
+        
+        Args:
+            observations: List of observation dicts
+        """
+        for obs in observations:
+            if "_parsed_response" not in obs:
+                obs["_parsed_response"] = parse_json_body(obs.get("response_body"))
+            if "_parsed_request" not in obs:
+                obs["_parsed_request"] = parse_json_body(obs.get("request_body"))
+    
     def _cluster_by_url(
         self,
         observations: list[dict[str, Any]]
@@ -114,15 +317,13 @@ class AnalystAgent(BaseAgent):
         """
         clusters: dict[str, list[dict]] = defaultdict(list)
         
+        # Bind hot-loop lookups to locals
+        to_pattern = _url_to_pattern
+        cluster_for = clusters.__getitem__
+        
         for obs in observations:
-            url = obs.get("url", "")
-            method = obs.get("method", "GET")
-            
-            # Generate pattern
-            pattern = self._url_to_pattern(url)
-            key = f"{method} {pattern}"
-            
-            clusters[key].append(obs)
+            get = obs.get
+            cluster_for(f"{get('method', 'GET')} {to_pattern(get('url', ''))}").append(obs)
         
         return dict(clusters)
     
@@ -136,27 +337,7 @@ class AnalystAgent(BaseAgent):
         Returns:
             URL pattern with placeholders
         """
-        # Parse URL
-        from urllib.parse import urlparse, parse_qs
-        
-        parsed = urlparse(url)
-        path = parsed.path
-        
-        # Split path into segments
-        segments = path.split('/')
-        pattern_segments = []
-        
-        for segment in segments:
-            if not segment:
-                continue
-            
-            # Check if segment is dynamic (UUID, number, etc.)
-            if self._is_dynamic_segment(segment):
-                pattern_segments.append("{id}")
-            else:
-                pattern_segments.append(segment)
-        
-        return '/' + '/'.join(pattern_segments)
+        return _url_to_pattern(url)
     
     def _is_dynamic_segment(self, segment: str) -> bool:
         """
@@ -168,23 +349,7 @@ class AnalystAgent(BaseAgent):
         Returns:
             True if segment is dynamic
         """
-        # UUID pattern
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if re.match(uuid_pattern, segment, re.IGNORECASE):
-            return True
-        
-        # Numeric ID
-        if segment.isdigit():
-            return True
-        
-        # Alphanumeric ID (high entropy)
-        if len(segment) >= 8 and segment.isalnum():
-            # Check entropy - if mostly random chars, likely an ID
-            unique_chars = len(set(segment))
-            if unique_chars > len(segment) * 0.5:
-                return True
-        
-        return False
+        return _is_dynamic_segment(segment)
     
     async def _generate_schema_hypothesis(
         self,
@@ -201,6 +366,35 @@ class AnalystAgent(BaseAgent):
         Returns:
             Hypothesis dictionary or None
         """
+        cluster = self._prepare_cluster(pattern, observations)
+        if not cluster:
+            return None
+        
+        # LLM enrichment for semantics
+        if self._needs_enrichment(cluster):
+            enrichment = await self._enrich_schema(
+                cluster["path"], cluster["schema_json"], cluster["samples"]
+            )
+        else:
+            enrichment = self._default_enrichment(cluster["path"])
+        
+        return self._assemble_hypothesis(cluster, enrichment)
+    
+    def _prepare_cluster(
+        self,
+        pattern: str,
+        observations: list[dict[str, Any]]
+    ) -> dict[str, Any] | None:
+        """
+        Infer schemas and collect samples for a cluster (no LLM work).
+        
+        Args:
+            pattern: URL pattern (e.g., "GET /api/users/{id}")
+            observations: Observations for this pattern
+            
+        Returns:
+            Prepared cluster dictionary or None
+        """
         if not observations:
             return None
         
@@ -215,38 +409,70 @@ class AnalystAgent(BaseAgent):
         
         # Get sample responses for LLM enrichment
         samples = [
-            obs.get("response_body", "")[:500]
+            _body_snippet(obs.get("response_body"), 500)
             for obs in observations[:3]
             if obs.get("response_body")
         ]
         
-        # LLM enrichment for semantics
-        enrichment = await self._enrich_schema(path, response_schema, samples)
+        return {
+            "pattern": pattern,
+            "method": method,
+            "path": path,
+            "observations": observations,
+            "request_schema": request_schema,
+            "response_schema": response_schema,
+            # Serialized once (and only if an LLM will read it)
+            "schema_json": json_dumps(response_schema)[:2000] if self.llm is not None else "",
+            "samples": samples,
+        }
+    
+    def _assemble_hypothesis(
+        self,
+        cluster: dict[str, Any],
+        enrichment: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Build the hypothesis dict from a prepared cluster and its enrichment.
+        
+        Args:
+            cluster: Output of _prepare_cluster
+            enrichment: Semantic enrichment for the cluster
+            
+        Returns:
+            Hypothesis dictionary
+        """
+        pattern = cluster["pattern"]
+        method = cluster["method"]
+        path = cluster["path"]
+        observations = cluster["observations"]
         
         # Calculate initial confidence
         evidence_count = len(observations)
         confidence = self._calculate_initial_confidence(evidence_count)
         
         # Build evidence references
-        evidence = [
-            {
-                "observation_id": obs.get("id", "unknown"),
-                "timestamp": obs.get("timestamp", ""),
-                "summary": f"{method} {obs.get('url', '')} -> {obs.get('status_code', 0)}",
-                "strength": "strong" if obs.get("status_code", 0) == 200 else "moderate"
-            }
-            for obs in observations[:10]  # Limit evidence refs
-        ]
+        evidence = []
+        add_evidence = evidence.append
+        
+        for obs in observations[:10]:  # Limit evidence refs
+            get = obs.get
+            status_code = get("status_code", 0)
+            add_evidence({
+                "observation_id": get("id", "unknown"),
+                "timestamp": get("timestamp", ""),
+                "summary": f"{method} {get('url', '')} -> {status_code}",
+                "strength": "strong" if status_code == 200 else "moderate"
+            })
         
         # Build hypothesis
         hypothesis = {
-            "id": f"hyp_schema_{hash(pattern) % 100000}",
+            "id": self._hypothesis_id(pattern),
             "type": HypothesisType.ENDPOINT_SCHEMA.value,
             "description": enrichment.get("description", f"API endpoint: {pattern}"),
             "endpoint_pattern": path,
             "method": method,
-            "request_schema": request_schema,
-            "response_schema": response_schema,
+            "request_schema": cluster["request_schema"],
+            "response_schema": cluster["response_schema"],
             "field_semantics": enrichment.get("field_semantics", {}),
             "supporting_evidence": evidence,
             "competing_explanations": enrichment.get("competing_explanations", []),
@@ -261,6 +487,25 @@ class AnalystAgent(BaseAgent):
         
         return hypothesis
     
+    def _hypothesis_id(self, pattern: str) -> str:
+        """
+        Get the hypothesis ID for a cluster pattern.
+        
+        Derived from a BLAKE2b digest (stable across processes, unlike the
+        salted built-in hash) and memoized per agent instance.
+        
+        Args:
+            pattern: Cluster key (e.g., "GET /api/users/{id}")
+            
+        Returns:
+            Hypothesis ID
+        """
+        hypothesis_id = self._pattern_ids.get(pattern)
+        if hypothesis_id is None:
+            digest = hashlib.blake2b(pattern.encode("utf-8"), digest_size=6).hexdigest()
+            hypothesis_id = self._pattern_ids[pattern] = f"hyp_schema_{digest}"
+        return hypothesis_id
+    
     def _build_schema(
         self,
         observations: list[dict[str, Any]],
@@ -280,19 +525,19 @@ class AnalystAgent(BaseAgent):
             return {"type": "object", "properties": {}}
         
         builder = SchemaBuilder()
+        body_key = f"{data_type}_body"
+        parsed_key = f"_parsed_{data_type}"
         
         for obs in observations:
-            body_key = f"{data_type}_body"
-            body = obs.get(body_key)
+            if parsed_key in obs:
+                data = obs[parsed_key]
+            else:
+                data = parse_json_body(obs.get(body_key))
             
-            if body:
+            if data is not None:
                 try:
-                    if isinstance(body, str):
-                        data = json.loads(body)
-                    else:
-                        data = body
                     builder.add_object(data)
-                except (json.JSONDecodeError, TypeError):
+                except TypeError:
                     pass
         
         return builder.to_schema()
@@ -300,7 +545,7 @@ class AnalystAgent(BaseAgent):
     async def _enrich_schema(
         self,
         endpoint: str,
-        schema: dict[str, Any],
+        schema_json: str,
         samples: list[str]
     ) -> dict[str, Any]:
         """
@@ -308,18 +553,14 @@ class AnalystAgent(BaseAgent):
         
         Args:
             endpoint: Endpoint pattern
-            schema: JSON schema
+            schema_json: Serialized (truncated) JSON schema
             samples: Sample response bodies
             
         Returns:
             Enrichment dictionary
         """
         if not self.llm:
-            return {
-                "description": f"Endpoint: {endpoint}",
-                "field_semantics": {},
-                "competing_explanations": []
-            }
+            return self._default_enrichment(endpoint)
         
         prompt = f"""Analyze this API endpoint and provide semantic enrichment:
 
@@ -327,7 +568,7 @@ ENDPOINT: {endpoint}
 
 INFERRED SCHEMA:
 ```json
-{json.dumps(schema, indent=2)[:2000]}
+{schema_json}
 ```
 
 SAMPLE RESPONSES:
@@ -341,25 +582,163 @@ Provide your analysis as JSON with:
         try:
             result = await self._invoke_llm_structured(
                 prompt=prompt,
-                output_schema={
-                    "type": "object",
-                    "properties": {
-                        "description": {"type": "string"},
-                        "field_semantics": {"type": "object"},
-                        "competing_explanations": {"type": "array", "items": {"type": "string"}}
-                    }
-                },
+                output_schema=ENRICHMENT_OUTPUT_SCHEMA,
                 system_prompt=SCHEMA_ENRICHMENT_PROMPT,
                 temperature=0.5
             )
             return result
         except Exception as e:
             self.log(f"LLM enrichment failed: {e}")
-            return {
-                "description": f"Endpoint: {endpoint}",
-                "field_semantics": {},
-                "competing_explanations": []
-            }
+            return self._default_enrichment(endpoint)
+    
+    def _needs_enrichment(self, cluster: dict[str, Any]) -> bool:
+        """
+        Check whether a cluster is worth an LLM enrichment call.
+        
+        Args:
+            cluster: Prepared cluster dictionary
+            
+        Returns:
+            True if an LLM is configured and there is schema or sample data
+        """
+        if self.llm is None:
+            return False
+        return bool(cluster["response_schema"].get("properties") or cluster["samples"])
+    
+    def _default_enrichment(self, endpoint: str) -> dict[str, Any]:
+        """
+        Build the enrichment used when the LLM is skipped or fails.
+        
+        Args:
+            endpoint: Endpoint pattern
+            
+        Returns:
+            Enrichment dictionary
+        """
+        return {
+            "description": f"Endpoint: {endpoint}",
+            "field_semantics": {},
+            "competing_explanations": []
+        }
+    
+    async def _enrich_clusters(
+        self,
+        clusters: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Enrich prepared clusters in batches, overlapping the LLM round-trips.
+        
+        Args:
+            clusters: Prepared cluster dictionaries
+            
+        Returns:
+            Enrichment dictionaries in cluster order
+        """
+        enrichments = [self._default_enrichment(c["path"]) for c in clusters]
+        
+        # Only clusters with something to describe go to the LLM
+        targets = [i for i, c in enumerate(clusters) if self._needs_enrichment(c)]
+        items = [
+            (clusters[i]["path"], clusters[i]["schema_json"], clusters[i]["samples"])
+            for i in targets
+        ]
+        batches = [
+            items[i:i + ENRICHMENT_BATCH_SIZE]
+            for i in range(0, len(items), ENRICHMENT_BATCH_SIZE)
+        ]
+        
+        async def run(batch):
+            async with self._llm_semaphore:
+                return await self._enrich_schemas_batched(batch)
+        
+        results = await asyncio.gather(
+            *(run(batch) for batch in batches),
+            return_exceptions=True
+        )
+        
+        position = 0
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                self.log(f"LLM enrichment failed: {result}")
+            else:
+                for offset, enrichment in enumerate(result):
+                    enrichments[targets[position + offset]] = enrichment
+            position += len(batch)
+        
+        return enrichments
+    
+    async def _enrich_schemas_batched(
+        self,
+        items: list[tuple[str, str, list[str]]]
+    ) -> list[dict[str, Any]]:
+        """
+        Enrich several endpoint schemas with a single LLM call.
+        
+        Each endpoint is tagged with a positional [index] so the results
+        can be mapped back even if the model reorders or drops entries.
+        
+        Args:
+            items: (endpoint, schema_json, samples) tuples
+            
+        Returns:
+            Enrichment dictionaries, one per item and in the same order
+        """
+        fallbacks = [self._default_enrichment(endpoint) for endpoint, _, _ in items]
+        
+        if not items or not self.llm:
+            return fallbacks
+        
+        if len(items) == 1:
+            endpoint, schema_json, samples = items[0]
+            return [await self._enrich_schema(endpoint, schema_json, samples)]
+        
+        sections = []
+        for index, (endpoint, schema_json, samples) in enumerate(items, start=1):
+            sections.append(f"""[{index}] ENDPOINT: {endpoint}
+
+INFERRED SCHEMA:
+```json
+{schema_json}
+```
+
+SAMPLE RESPONSES:
+{chr(10).join(samples[:3])}""")
+        
+        prompt = f"""Analyze these {len(items)} API endpoints and provide semantic enrichment for each:
+
+{(chr(10) * 2).join(sections)}
+
+Provide your analysis as JSON with a "results" array containing one entry per endpoint:
+- "index": The [index] of the endpoint
+- "description": A clear description of what this endpoint does
+- "field_semantics": Object mapping field names to their meaning
+- "competing_explanations": Array of alternative interpretations"""
+
+        try:
+            result = await self._invoke_llm_structured(
+                prompt=prompt,
+                output_schema=BATCH_ENRICHMENT_OUTPUT_SCHEMA,
+                system_prompt=SCHEMA_ENRICHMENT_PROMPT,
+                temperature=0.5
+            )
+        except Exception as e:
+            self.log(f"Batched LLM enrichment failed: {e}")
+            return fallbacks
+        
+        enrichments = list(fallbacks)
+        for entry in result.get("results", []):
+            try:
+                index = int(entry.get("index", 0)) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < len(enrichments):
+                enrichments[index] = {
+                    "description": entry.get("description", fallbacks[index]["description"]),
+                    "field_semantics": entry.get("field_semantics", {}),
+                    "competing_explanations": entry.get("competing_explanations", [])
+                }
+        
+        return enrichments
     
     def _calculate_initial_confidence(self, evidence_count: int) -> float:
         """
@@ -395,17 +774,17 @@ Provide your analysis as JSON with:
         Returns:
             Merged schema
         """
+        # Nothing to union
+        if not existing:
+            return new
+        if not new or existing == new:
+            return existing
+        
         if not GENSON_AVAILABLE:
             return new
         
         builder = SchemaBuilder()
-        
-        # Add existing schema
-        if existing:
-            builder.add_schema(existing)
-        
-        # Add new schema
-        if new:
-            builder.add_schema(new)
+        builder.add_schema(existing)
+        builder.add_schema(new)
         
         return builder.to_schema()
@@ -3,7 +3,13 @@ Base Agent Class.
 Common functionality for all agents in the system.
 """
 
+import asyncio
+import atexit
+import logging
+import queue
+import sys
 from abc import ABC, abstractmethod
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 from datetime import datetime
 
@@ -12,6 +18,73 @@ from ..memory.scratchpad import AgentScratchpad
 from ..llm.provider import LLMProvider, get_llm_provider
 
 
+# Parent logger for all agents; records are handed to a background thread
+_AGENT_LOGGER_NAME = "agent"
+_log_listener: QueueListener | None = None
+
+
+def _configure_agent_logging() -> None:
+    """
+    Route agent log records through a queue so stdout I/O happens on a
+    listener thread instead of blocking the event loop. Idempotent.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(
+        "[%(asctime)s] [%(agent)s] %(message)s",
+        datefmt="%H:%M:%S"
+    ))
+    
+    logger = logging.getLogger(_AGENT_LOGGER_NAME)
+    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+    
+    _log_listener = QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+# ISO timestamp shared by every message created in the current loop tick
+_tick_iso: str | None = None
+
+
+def _clear_tick_timestamp() -> None:
+    global _tick_iso
+    _tick_iso = None
+
+
+def tick_timestamp() -> str:
+    """
+    Get the current time as an ISO string, memoized per event-loop tick.
+    
+    Messages created in the same tick share one clock read; the memo is
+    cleared by a call_soon callback. Outside a running loop this is just
+    datetime.now().isoformat().
+    
+    Returns:
+        ISO 8601 timestamp
+    """
+    global _tick_iso
+    if _tick_iso is not None:
+        return _tick_iso
+    
+    iso = datetime.now().isoformat()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return iso
+    
+    _tick_iso = iso
+    loop.call_soon(_clear_tick_timestamp)
+    return iso
+
+
 class BaseAgent(ABC):
     """
     Abstract base class for all agents.
@@ -32,6 +105,12 @@ class BaseAgent(ABC):
         """
         self.name = name
         self.llm = llm_provider or get_llm_provider()
+        
+        _configure_agent_logging()
+        self._logger = logging.LoggerAdapter(
+            logging.getLogger(f"{_AGENT_LOGGER_NAME}.{name}"),
+            {"agent": name}
+        )
         self.scratchpad: AgentScratchpad | None = None
     
     def set_scratchpad(self, scratchpad: AgentScratchpad) -> None:
@@ -51,10 +130,12 @@ class BaseAgent(ABC):
         """
         pass
     
-    def log(self, message: str) -> None:
-        """Log a message with agent name and timestamp."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] [{self.name}] {message}")
+    def log(self, message: str, *args: Any) -> None:
+        """
+        Log a message with agent name and timestamp (written off-loop).
+        %-style args are formatted lazily, only if the record is emitted.
+        """
+        self._logger.info(message, *args)
     
     def create_message(self, content: str) -> dict[str, Any]:
         """
@@ -70,7 +151,7 @@ class BaseAgent(ABC):
             "role": "assistant",
             "content": content,
             "name": self.name,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": tick_timestamp()
         }
     
     async def _invoke_llm(
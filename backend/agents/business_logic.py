@@ -3,13 +3,25 @@ Business Logic Agent - The Workflow Detective.
 Infers server-side state machines, enforced step ordering, permission boundaries, and hidden constraints.
 """
 
-import json
-from typing import Any
-from collections import defaultdict
+import asyncio
+import hashlib
+import heapq
+import itertools
+import re
+import string
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from typing import Any, NamedTuple
+from collections import Counter, OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
 
 from .base import BaseAgent
+from ..core.config import settings
 from ..core.state import AgentState
 from ..core.models import HypothesisType, EnforcementRuleType
+from ..utils.json_codec import json_dumps, parse_json_body
 
 
 # System prompt for business logic inference
@@ -30,6 +42,352 @@ For each inference:
 
 Be rigorous. Only infer what the evidence strongly supports."""
 
+# Schema for a single state-dependency analysis
+STATE_DEPENDENCY_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "has_dependency": {"type": "boolean"},
+        "description": {"type": "string"},
+        "prerequisite": {"type": "string"},
+        "confidence": {"type": "number"}
+    }
+}
+
+# Schema for batched state-dependency analysis (one entry per [index])
+BATCH_STATE_DEPENDENCY_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    **STATE_DEPENDENCY_OUTPUT_SCHEMA["properties"]
+                }
+            }
+        }
+    }
+}
+
+# Error-message keywords, one named group per constraint kind
+_CONSTRAINT_RE = re.compile(
+    r"(?P<required>required|missing|empty)"
+    r"|(?P<format>invalid|format|type)"
+    r"|(?P<sequence>sequence|first|before|must)",
+    re.IGNORECASE
+)
+
+# Group name -> (priority, rule type, description); lower priority wins
+_CONSTRAINT_RULES = {
+    "required": (0, EnforcementRuleType.FIELD_CONSTRAINT, "has required field validation"),
+    "format": (1, EnforcementRuleType.FIELD_CONSTRAINT, "has field format validation"),
+    "sequence": (2, EnforcementRuleType.REQUIRED_SEQUENCE, "requires prerequisite action"),
+}
+
+# Prompt templates. Static instructions come before the per-call data so
+# consecutive calls share the longest possible prompt prefix (provider-side
+# prompt caching) and only the substitution work is done per call.
+_STATE_DEPENDENCY_PROMPT = string.Template("""Analyze these API interaction patterns for state dependencies.
+
+Is there a state dependency? What prerequisite might be required?
+Respond with JSON including:
+- "has_dependency": boolean
+- "description": string explaining the rule
+- "prerequisite": what must happen first
+- "confidence": 0-1
+
+$section""")
+
+_BATCH_STATE_DEPENDENCY_PROMPT = string.Template("""Analyze the API endpoints below for state dependencies.
+
+For each endpoint: is there a state dependency? What prerequisite might be required?
+Respond with JSON containing a "results" array with one entry per endpoint:
+- "index": the [index] of the endpoint
+- "has_dependency": boolean
+- "description": string explaining the rule
+- "prerequisite": what must happen first
+- "confidence": 0-1
+
+ENDPOINTS ($count):
+
+$sections""")
+
+_STATE_DEPENDENCY_SECTION = string.Template("""ENDPOINT: $endpoint
+
+SUCCESSFUL REQUESTS ($success_count):
+$successes
+
+FAILED REQUESTS ($failure_count):
+$failures
+
+CANDIDATE PREREQUISITES (called between a failure and a later success):
+$prerequisites""")
+
+# Max endpoints per batched state-dependency prompt
+STATE_DEPENDENCY_BATCH_SIZE = 8
+
+# LRU + TTL cache for state-dependency LLM analyses
+STATE_DEPENDENCY_CACHE_SIZE = 1024
+STATE_DEPENDENCY_CACHE_TTL = 600.0  # seconds
+
+# Status-code classes used by the observation filters
+_SUCCESS_STATUSES = frozenset(range(200, 300))
+_CLIENT_ERROR_STATUSES = frozenset(range(400, 500))
+_AUTH_STATUSES = frozenset({401, 403})
+_RATE_LIMIT_STATUSES = frozenset({429})
+
+# Retention for the agent's rolling state/error history
+STATE_HISTORY_LIMIT = 10_000
+ERROR_PATTERN_LIMIT = 2_000
+
+
+def _lower_headers(headers: dict[str, str]) -> dict[str, str]:
+    """
+    Normalize header names to lowercase for single, case-insensitive lookups.
+    
+    Args:
+        headers: Raw header mapping
+        
+    Returns:
+        Header mapping with lowercased names
+    """
+    return {k.lower(): v for k, v in headers.items()}
+
+
+def _endpoint_of(url: str) -> str:
+    """
+    Strip the query string from a URL, interning the result.
+    
+    Interned endpoints make the per-endpoint dict lookups identity hits.
+    
+    Args:
+        url: Request URL
+        
+    Returns:
+        URL without its query string
+    """
+    query_start = url.find("?")
+    return sys.intern(url if query_start < 0 else url[:query_start])
+
+
+def _repeat_confidence(base: float, count: int) -> float:
+    """
+    Scale a hypothesis' confidence with the number of repeat observations.
+    
+    Args:
+        base: Confidence for a single observation
+        count: Number of supporting observations
+        
+    Returns:
+        Confidence, +0.05 per extra observation, capped at 0.95
+    """
+    return min(0.95, base + 0.05 * (count - 1))
+
+
+class _PrereqScan(NamedTuple):
+    """Incremental prerequisite-scan state, kept across _find_prerequisite_hints calls."""
+    # Endpoint ID -> failure rows since its last success (ascending)
+    open_failures: dict[int, list[int]]
+    # Endpoint ID -> row of its latest success
+    last_success: dict[int, int]
+    # Endpoint ID -> prerequisite ID counts over the window
+    counts: defaultdict[int, Counter]
+    # Heap of (first failure row, seq, endpoint ID, failure rows, {prerequisite ID: success row})
+    # behind counts, so pairs can be re-derived or expired as the window slides
+    counted: list[tuple[int, int, int, list[int], dict[int, int]]]
+    seq: itertools.count
+
+
+def _scan_prereq_pairs(
+    endpoints: array,
+    statuses: array,
+    start: int,
+    stop: int,
+    scan: _PrereqScan
+) -> None:
+    """
+    Incrementally scan the numeric history for (endpoint, prerequisite) pairs.
+    
+    For every endpoint whose failure (>= 400) is later followed by a
+    success (2xx), each other endpoint that succeeded in between is
+    counted as a candidate prerequisite. Only each endpoint's latest
+    success row is tracked, so every row is visited once and no window
+    is re-walked. Works on flat int ring buffers so the loop touches no
+    per-observation dicts.
+    
+    Args:
+        endpoints: Ring of interned endpoint IDs; row i lives at i % len
+        statuses: Ring of status codes aligned with endpoints
+        start: Absolute index of the first row not scanned yet
+        stop: Absolute index one past the last recorded row
+        scan: Scan state (updated)
+    """
+    open_failures = scan.open_failures
+    last_success = scan.last_success
+    size = len(endpoints)
+    
+    for i in range(start, stop):
+        slot = i % size
+        endpoint_id = endpoints[slot]
+        status = statuses[slot]
+        
+        if status >= 400:
+            rows = open_failures.get(endpoint_id)
+            if rows is None:
+                open_failures[endpoint_id] = [i]
+            else:
+                rows.append(i)
+        elif 200 <= status < 300:
+            rows = open_failures.pop(endpoint_id, None)
+            if rows:
+                first = rows[0]
+                prereq_rows = {
+                    prereq_id: row for prereq_id, row in last_success.items()
+                    if row > first and prereq_id != endpoint_id
+                }
+                if prereq_rows:
+                    scan.counts[endpoint_id].update(prereq_rows.keys())
+                    heapq.heappush(
+                        scan.counted, (first, next(scan.seq), endpoint_id, rows, prereq_rows)
+                    )
+            last_success[endpoint_id] = i
+
+
+def _expire_prereq_pairs(window_start: int, scan: _PrereqScan) -> None:
+    """
+    Slide the scan state to a new window start.
+    
+    Failure rows that left the window are dropped. A counted pair whose
+    first failure expired is re-derived from the endpoint's next failure
+    in the window (keeping only prerequisites that succeeded after it),
+    matching a full scan of the retained rows.
+    
+    Args:
+        window_start: Absolute index of the oldest retained row
+        scan: Scan state (updated)
+    """
+    for endpoint_id, rows in list(scan.open_failures.items()):
+        if rows[-1] < window_start:
+            del scan.open_failures[endpoint_id]
+        elif rows[0] < window_start:
+            del rows[:bisect_left(rows, window_start)]
+    
+    for endpoint_id in [e for e, row in scan.last_success.items() if row < window_start]:
+        del scan.last_success[endpoint_id]
+    
+    counted = scan.counted
+    while counted and counted[0][0] < window_start:
+        _, _, endpoint_id, rows, prereq_rows = heapq.heappop(counted)
+        del rows[:bisect_left(rows, window_start)]
+        first = rows[0] if rows else None
+        
+        counter = scan.counts[endpoint_id]
+        for prereq_id in [p for p, row in prereq_rows.items() if first is None or row <= first]:
+            del prereq_rows[prereq_id]
+            counter[prereq_id] -= 1
+            if counter[prereq_id] <= 0:
+                del counter[prereq_id]
+        if not counter:
+            del scan.counts[endpoint_id]
+        
+        if prereq_rows:
+            heapq.heappush(counted, (first, next(scan.seq), endpoint_id, rows, prereq_rows))
+
+
+@dataclass(slots=True, frozen=True)
+class _RuleHypothesis:
+    """
+    Business-rule hypothesis as built by the detectors.
+    Converted to the shared hypothesis dict shape only at the execute() boundary.
+    """
+    id: str
+    type: str
+    description: str
+    rule_type: str
+    trigger_conditions: dict[str, Any]
+    supporting_evidence: list[dict[str, Any]]
+    confidence: float
+    untested_assumptions: tuple[str, ...]
+    observed_response: dict[str, Any] | None = None
+    created_by: str = "business_logic"
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the hypothesis dict stored in agent state."""
+        hypothesis = {
+            "id": self.id,
+            "type": self.type,
+            "description": self.description,
+            "rule_type": self.rule_type,
+            "trigger_conditions": self.trigger_conditions,
+            "supporting_evidence": self.supporting_evidence,
+            "confidence": self.confidence,
+            "untested_assumptions": list(self.untested_assumptions),
+            "created_by": self.created_by
+        }
+        if self.observed_response is not None:
+            hypothesis["observed_response"] = self.observed_response
+        return hypothesis
+
+
+# Permission-gate specializations by status:
+# (id prefix, description suffix, requirement, status text, base confidence, assumptions)
+_PERMISSION_GATES = {
+    401: (
+        "hyp_perm",
+        "requires authentication",
+        "authentication",
+        "Unauthorized",
+        0.7,
+        ("May accept different auth methods", "Role requirements unknown")
+    ),
+    403: (
+        "hyp_role",
+        "requires elevated permissions",
+        "elevated_role",
+        "Forbidden",
+        0.6,
+        ("Specific role requirement unknown", "May be resource-specific permission")
+    ),
+}
+
+_RATE_LIMIT_ASSUMPTIONS = ("Limit may vary by auth level", "Window duration uncertain")
+_STATE_TRANSITION_ASSUMPTIONS = (
+    "Sequence requirements not fully mapped",
+    "May have additional prerequisites"
+)
+_ENFORCEMENT_ASSUMPTIONS = (
+    "Error message may not fully describe constraint",
+    "Validation rules may be request-specific"
+)
+
+
+class _StateRow(NamedTuple):
+    """One observed request in the agent's state history."""
+    url: str
+    method: str
+    status: int
+    action: Any
+    timestamp: Any
+
+
+@dataclass
+class _ObservationBuckets:
+    """Observations classified in a single pass, shared by all detectors."""
+    # endpoint -> (2xx observations, >= 400 observations)
+    by_endpoint: dict[str, tuple[list[dict[str, Any]], list[dict[str, Any]]]] = field(
+        default_factory=lambda: defaultdict(lambda: ([], []))
+    )
+    client_errors: list[dict[str, Any]] = field(default_factory=list)  # 4xx
+    # 401/403 observations grouped by (url, status)
+    auth_errors: dict[tuple[str, int], list[dict[str, Any]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    # 429 observations grouped by url
+    rate_limited: dict[str, list[dict[str, Any]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
 
 class BusinessLogicAgent(BaseAgent):
     """
@@ -46,10 +404,44 @@ class BusinessLogicAgent(BaseAgent):
         """
         super().__init__(name="business_logic", **kwargs)
         
-        # State tracking
-        self.state_history: list[dict[str, Any]] = []
-        self.transition_matrix: dict[str, dict[str, list]] = defaultdict(lambda: defaultdict(list))
-        self.error_patterns: list[dict[str, Any]] = []
+        # State tracking (bounded FIFOs so long sessions don't grow unbounded)
+        self.state_history: deque[_StateRow] = deque(maxlen=STATE_HISTORY_LIMIT)
+        # Flat (src, dst) -> transitions map; avoids a nested defaultdict per source
+        self.transition_matrix: dict[tuple[str, str], list] = defaultdict(list)
+        self.error_patterns: deque[dict[str, Any]] = deque(maxlen=ERROR_PATTERN_LIMIT)
+        
+        # Numeric (SoA) mirror of state_history for sequence scans: fixed-size
+        # rings of interned endpoint IDs and status codes written in lockstep;
+        # absolute row i lives at slot i % STATE_HISTORY_LIMIT. The intern table
+        # grows with distinct endpoints (query strings stripped), like transition_matrix
+        self._endpoint_ids: dict[str, int] = {}
+        self._endpoint_names: list[str] = []
+        self._history_endpoints = array("i", [0]) * STATE_HISTORY_LIMIT
+        self._history_statuses = array("H", [0]) * STATE_HISTORY_LIMIT
+        self._history_count = 0
+        
+        # Incremental prerequisite scan over the window: absolute rows already
+        # scanned, plus the scan state that slides with the window
+        self._history_scanned = 0
+        self._prereq_scan = _PrereqScan(
+            open_failures={},
+            last_success={},
+            counts=defaultdict(Counter),
+            counted=[],
+            seq=itertools.count()
+        )
+        
+        # Endpoint -> likely prerequisite endpoints, refreshed per execute()
+        self._prerequisite_hints: dict[str, list[str]] = {}
+        
+        # Fingerprint -> (expiry, LLM analysis), most recently used last
+        self._state_dependency_cache: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        
+        # Monotonic component of hypothesis IDs
+        self._id_counter = itertools.count()
+        
+        # Bounds concurrent state-dependency calls to the LLM provider
+        self._llm_semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
     
     async def execute(self, state: AgentState) -> dict[str, Any]:
         """
@@ -72,31 +464,31 @@ class BusinessLogicAgent(BaseAgent):
         
         self.log(f"Analyzing {len(observations)} observations for business logic")
         
-        # Track state transitions
-        self._track_states(observations)
+        # Track states and classify observations in one pass
+        buckets = self._bucket_observations(observations)
         
         # Detect patterns
         hypotheses = []
         
         # 1. State transition detection
-        transition_hyps = await self._detect_state_transitions(observations)
+        transition_hyps = await self._detect_state_transitions(buckets)
         hypotheses.extend(transition_hyps)
         
         # 2. Enforcement rule detection
-        enforcement_hyps = await self._detect_enforcement_rules(observations)
+        enforcement_hyps = self._detect_enforcement_rules(buckets)
         hypotheses.extend(enforcement_hyps)
         
         # 3. Permission inference
-        permission_hyps = await self._detect_permissions(observations)
+        permission_hyps = self._detect_permissions(buckets)
         hypotheses.extend(permission_hyps)
         
         # 4. Rate limit detection
-        rate_limit_hyps = await self._detect_rate_limits(observations)
+        rate_limit_hyps = self._detect_rate_limits(buckets)
         hypotheses.extend(rate_limit_hyps)
         
         # Add to existing pending hypotheses
         existing = state.get("pending_hypotheses", [])
-        all_hypotheses = existing + hypotheses
+        all_hypotheses = existing + [h.to_dict() for h in hypotheses]
         
         self.log(f"Generated {len(hypotheses)} business logic hypotheses")
         
@@ -109,36 +501,134 @@ class BusinessLogicAgent(BaseAgent):
             )]
         }
     
-    def _track_states(self, observations: list[dict[str, Any]]) -> None:
+    def _make_id(self, prefix: str, *parts: str) -> str:
         """
-        Track state transitions from observations.
+        Build a unique hypothesis ID with a stable content fingerprint.
+        
+        Args:
+            prefix: ID prefix (e.g., "hyp_perm")
+            *parts: Strings identifying the hypothesis subject
+            
+        Returns:
+            ID of the form "{prefix}_{counter}_{fingerprint}"
+        """
+        fingerprint = hashlib.blake2b(
+            "|".join(parts).encode("utf-8"), digest_size=4
+        ).hexdigest()
+        return f"{prefix}_{next(self._id_counter)}_{fingerprint}"
+    
+    def _bucket_observations(
+        self,
+        observations: list[dict[str, Any]]
+    ) -> _ObservationBuckets:
+        """
+        Track state transitions and classify observations in a single pass.
         
         Args:
             observations: New observations
+            
+        Returns:
+            Observations grouped by endpoint and by status class
         """
+        buckets = _ObservationBuckets()
+        by_endpoint = buckets.by_endpoint
+        
         for obs in observations:
-            state_info = {
-                "url": obs.get("url", ""),
-                "method": obs.get("method", ""),
-                "status": obs.get("status_code", 0),
-                "action": obs.get("ui_action"),
-                "timestamp": obs.get("timestamp", "")
-            }
-            self.state_history.append(state_info)
+            url = obs.get("url", "")
+            status = obs.get("status_code", 0)
+            
+            self.state_history.append(_StateRow(
+                url,
+                obs.get("method", ""),
+                status,
+                obs.get("ui_action"),
+                obs.get("timestamp", "")
+            ))
+            
+            endpoint = obs.get("_endpoint")
+            if endpoint is None:
+                endpoint = obs["_endpoint"] = _endpoint_of(url)
+            self._record_history(endpoint, status)
+            
+            if status in _SUCCESS_STATUSES:
+                by_endpoint[endpoint][0].append(obs)
             
             # Track error patterns
-            if obs.get("status_code", 0) >= 400:
+            elif status >= 400:
+                by_endpoint[endpoint][1].append(obs)
+                # Truncate once; every error-hypothesis builder reads this
+                obs["_body_200"] = (obs.get("response_body") or "")[:200]
                 self.error_patterns.append(obs)
+                if status in _CLIENT_ERROR_STATUSES:
+                    # Parse once; shared with the analyst's cache on the same dict
+                    if "_parsed_response" not in obs:
+                        obs["_parsed_response"] = parse_json_body(obs.get("response_body"))
+                    buckets.client_errors.append(obs)
+                    if status in _AUTH_STATUSES:
+                        buckets.auth_errors[(url, status)].append(obs)
+                    elif status in _RATE_LIMIT_STATUSES:
+                        buckets.rate_limited[url].append(obs)
+        
+        return buckets
+    
+    def _record_history(self, endpoint: str, status: int) -> None:
+        """
+        Write an observation into the numeric history rings (O(1); the
+        oldest row is overwritten once the window is full).
+        
+        Args:
+            endpoint: Endpoint path (query string stripped)
+            status: HTTP status code
+        """
+        endpoint_id = self._endpoint_ids.get(endpoint)
+        if endpoint_id is None:
+            endpoint_id = self._endpoint_ids[endpoint] = len(self._endpoint_names)
+            self._endpoint_names.append(endpoint)
+        
+        slot = self._history_count % STATE_HISTORY_LIMIT
+        self._history_endpoints[slot] = endpoint_id
+        self._history_statuses[slot] = status if 0 <= status <= 0xFFFF else 0
+        self._history_count += 1
+    
+    def _find_prerequisite_hints(self, limit: int = 3) -> dict[str, list[str]]:
+        """
+        Find endpoints that were called between a failure and a later
+        success of another endpoint, within the retained history window.
+        Only rows recorded since the last call are scanned; state that
+        has left the window is expired, so the counts equal a full scan
+        of the retained rows.
+        
+        Args:
+            limit: Max candidate prerequisites per endpoint
+            
+        Returns:
+            Endpoint -> most frequent candidate prerequisite endpoints
+        """
+        # Rows already overwritten in the ring are outside the window anyway
+        window_start = max(0, self._history_count - STATE_HISTORY_LIMIT)
+        _scan_prereq_pairs(
+            self._history_endpoints, self._history_statuses,
+            max(self._history_scanned, window_start), self._history_count,
+            self._prereq_scan
+        )
+        self._history_scanned = self._history_count
+        _expire_prereq_pairs(window_start, self._prereq_scan)
+        
+        names = self._endpoint_names
+        return {
+            names[endpoint_id]: [names[p] for p, _ in counter.most_common(limit)]
+            for endpoint_id, counter in self._prereq_scan.counts.items()
+        }
     
     async def _detect_state_transitions(
         self,
-        observations: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
+        buckets: _ObservationBuckets
+    ) -> list[_RuleHypothesis]:
         """
         Detect server-side state machine patterns.
         
         Args:
-            observations: Observations to analyze
+            buckets: Pre-classified observations
             
         Returns:
             List of state transition hypotheses
@@ -148,36 +638,51 @@ class BusinessLogicAgent(BaseAgent):
         # Look for sequences where order matters
         # (successful after prerequisite vs failed without)
         
-        # Group by endpoint
-        endpoint_results: dict[str, list[dict]] = defaultdict(list)
-        for obs in observations:
-            url = obs.get("url", "").split("?")[0]
-            endpoint_results[url].append(obs)
-        
         # Find endpoints with both success and failure
-        for endpoint, results in endpoint_results.items():
-            successes = [r for r in results if 200 <= r.get("status_code", 0) < 300]
-            failures = [r for r in results if r.get("status_code", 0) >= 400]
-            
+        candidates = []
+        for endpoint, (successes, failures) in buckets.by_endpoint.items():
             if successes and failures:
                 # Potential state-dependent endpoint
-                hypothesis = await self._analyze_state_dependency(
-                    endpoint, successes, failures
-                )
-                if hypothesis:
-                    hypotheses.append(hypothesis)
+                candidates.append((endpoint, successes, failures))
+        
+        if not candidates or not self.llm:
+            return hypotheses
+        
+        # Sequence evidence for the prompts, computed once per pass
+        self._prerequisite_hints = self._find_prerequisite_hints()
+        
+        # Batch the candidates and issue the batches concurrently
+        batches = [
+            candidates[i:i + STATE_DEPENDENCY_BATCH_SIZE]
+            for i in range(0, len(candidates), STATE_DEPENDENCY_BATCH_SIZE)
+        ]
+        
+        async def run(batch):
+            async with self._llm_semaphore:
+                return await self._analyze_state_dependencies_batch(batch)
+        
+        results = await asyncio.gather(
+            *(run(batch) for batch in batches),
+            return_exceptions=True
+        )
+        
+        for result in results:
+            if isinstance(result, BaseException):
+                self.log(f"LLM analysis failed: {result}")
+                continue
+            hypotheses.extend(h for h in result if h)
         
         return hypotheses
     
-    async def _detect_enforcement_rules(
+    def _detect_enforcement_rules(
         self,
-        observations: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
+        buckets: _ObservationBuckets
+    ) -> list[_RuleHypothesis]:
         """
         Detect server-side enforcement rules from error responses.
         
         Args:
-            observations: Observations to analyze
+            buckets: Pre-classified observations
             
         Returns:
             List of enforcement rule hypotheses
@@ -185,172 +690,126 @@ class BusinessLogicAgent(BaseAgent):
         hypotheses = []
         
         # Look for 400-level errors with informative messages
-        for obs in observations:
-            status = obs.get("status_code", 0)
-            if 400 <= status < 500:
-                body = obs.get("response_body", "")
-                
-                if body:
-                    try:
-                        error_data = json.loads(body) if isinstance(body, str) else body
-                        error_msg = (
-                            error_data.get("error") or 
-                            error_data.get("message") or 
-                            error_data.get("detail") or
-                            str(error_data)
-                        )
-                        
-                        hypothesis = self._create_enforcement_hypothesis(
-                            obs, status, error_msg
-                        )
-                        if hypothesis:
-                            hypotheses.append(hypothesis)
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+        for obs in buckets.client_errors:
+            error_data = obs.get("_parsed_response")
+            if error_data is None:
+                continue
+            
+            if isinstance(error_data, dict):
+                error_msg = (
+                    error_data.get("error") or 
+                    error_data.get("message") or 
+                    error_data.get("detail") or
+                    str(error_data)
+                )
+            else:
+                error_msg = str(error_data)
+            
+            hypotheses.append(self._create_enforcement_hypothesis(
+                obs, obs.get("status_code", 0), str(error_msg)
+            ))
         
         return hypotheses
     
-    async def _detect_permissions(
+    def _detect_permissions(
         self,
-        observations: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
+        buckets: _ObservationBuckets
+    ) -> list[_RuleHypothesis]:
         """
         Detect permission requirements from auth-related responses.
         
         Args:
-            observations: Observations to analyze
+            buckets: Pre-classified observations
             
         Returns:
             List of permission hypotheses
         """
         hypotheses = []
         
-        # Look for 401 (unauthorized) and 403 (forbidden) responses
-        auth_errors = [
-            obs for obs in observations
-            if obs.get("status_code") in (401, 403)
-        ]
-        
-        for obs in auth_errors:
-            status = obs.get("status_code")
-            url = obs.get("url", "")
+        # Look for 401 (unauthorized) and 403 (forbidden) responses,
+        # one hypothesis per (url, status) with all observations as evidence
+        for (url, status), group in buckets.auth_errors.items():
+            gate = _PERMISSION_GATES.get(status)
+            if gate is None:
+                continue
             
-            if status == 401:
-                # Endpoint requires authentication
-                hypothesis = {
-                    "id": f"hyp_perm_{hash(url) % 100000}",
-                    "type": HypothesisType.PERMISSION_GATE.value,
-                    "description": f"Endpoint {url} requires authentication",
-                    "rule_type": EnforcementRuleType.PERMISSION_GATE.value,
-                    "trigger_conditions": {
-                        "endpoint": url,
-                        "requirement": "authentication"
-                    },
-                    "observed_response": {
-                        "status": 401,
-                        "body": obs.get("response_body", "")[:200]
-                    },
-                    "supporting_evidence": [{
-                        "observation_id": obs.get("id"),
-                        "summary": f"401 Unauthorized on {url}",
-                        "strength": "strong"
-                    }],
-                    "confidence": 0.7,
-                    "untested_assumptions": [
-                        "May accept different auth methods",
-                        "Role requirements unknown"
-                    ],
-                    "created_by": "business_logic"
-                }
-                hypotheses.append(hypothesis)
-            
-            elif status == 403:
-                # Endpoint requires specific role/permission
-                hypothesis = {
-                    "id": f"hyp_role_{hash(url) % 100000}",
-                    "type": HypothesisType.PERMISSION_GATE.value,
-                    "description": f"Endpoint {url} requires elevated permissions",
-                    "rule_type": EnforcementRuleType.PERMISSION_GATE.value,
-                    "trigger_conditions": {
-                        "endpoint": url,
-                        "requirement": "elevated_role"
-                    },
-                    "observed_response": {
-                        "status": 403,
-                        "body": obs.get("response_body", "")[:200]
-                    },
-                    "supporting_evidence": [{
+            prefix, summary, requirement, status_text, confidence, assumptions = gate
+            hypotheses.append(_RuleHypothesis(
+                id=self._make_id(prefix, url),
+                type=HypothesisType.PERMISSION_GATE.value,
+                description=f"Endpoint {url} {summary}",
+                rule_type=EnforcementRuleType.PERMISSION_GATE.value,
+                trigger_conditions={
+                    "endpoint": url,
+                    "requirement": requirement
+                },
+                observed_response={
+                    "status": status,
+                    "body": group[0]["_body_200"]
+                },
+                supporting_evidence=[
+                    {
                         "observation_id": obs.get("id"),
-                        "summary": f"403 Forbidden on {url}",
+                        "summary": f"{status} {status_text} on {url}",
                         "strength": "strong"
-                    }],
-                    "confidence": 0.6,
-                    "untested_assumptions": [
-                        "Specific role requirement unknown",
-                        "May be resource-specific permission"
-                    ],
-                    "created_by": "business_logic"
-                }
-                hypotheses.append(hypothesis)
+                    }
+                    for obs in group
+                ],
+                confidence=_repeat_confidence(confidence, len(group)),
+                untested_assumptions=assumptions
+            ))
         
         return hypotheses
     
-    async def _detect_rate_limits(
+    def _detect_rate_limits(
         self,
-        observations: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
+        buckets: _ObservationBuckets
+    ) -> list[_RuleHypothesis]:
         """
         Detect rate limiting patterns.
         
         Args:
-            observations: Observations to analyze
+            buckets: Pre-classified observations
             
         Returns:
             List of rate limit hypotheses
         """
         hypotheses = []
         
-        # Look for 429 Too Many Requests
-        rate_limited = [
-            obs for obs in observations
-            if obs.get("status_code") == 429
-        ]
-        
-        for obs in rate_limited:
-            url = obs.get("url", "")
-            headers = obs.get("response_headers", {})
+        # Look for 429 Too Many Requests, one hypothesis per url
+        for url, group in buckets.rate_limited.items():
+            # Most recent response carries the freshest limit headers
+            headers = _lower_headers(group[-1].get("response_headers") or {})
             
             # Try to extract rate limit info from headers
-            retry_after = headers.get("retry-after", headers.get("Retry-After"))
-            rate_limit = headers.get("x-ratelimit-limit", headers.get("X-RateLimit-Limit"))
+            retry_after = headers.get("retry-after")
+            rate_limit = headers.get("x-ratelimit-limit")
             
-            hypothesis = {
-                "id": f"hyp_rate_{hash(url) % 100000}",
-                "type": HypothesisType.RATE_LIMIT.value,
-                "description": f"Endpoint {url} has rate limiting",
-                "rule_type": EnforcementRuleType.RATE_LIMIT.value,
-                "trigger_conditions": {
+            hypotheses.append(_RuleHypothesis(
+                id=self._make_id("hyp_rate", url),
+                type=HypothesisType.RATE_LIMIT.value,
+                description=f"Endpoint {url} has rate limiting",
+                rule_type=EnforcementRuleType.RATE_LIMIT.value,
+                trigger_conditions={
                     "endpoint": url,
                     "limit": rate_limit or "unknown",
                     "retry_after": retry_after or "unknown"
                 },
-                "observed_response": {
+                observed_response={
                     "status": 429,
-                    "headers": {k: v for k, v in headers.items() if "rate" in k.lower()}
+                    "headers": {k: v for k, v in headers.items() if "rate" in k}
                 },
-                "supporting_evidence": [{
-                    "observation_id": obs.get("id"),
-                    "summary": f"429 Rate Limited on {url}",
-                    "strength": "strong"
-                }],
-                "confidence": 0.8,
-                "untested_assumptions": [
-                    "Limit may vary by auth level",
-                    "Window duration uncertain"
+                supporting_evidence=[
+                    {
+                        "observation_id": obs.get("id"),
+                        "summary": f"429 Rate Limited on {url}",
+                        "strength": "strong"
+                    }
+                    for obs in group
                 ],
-                "created_by": "business_logic"
-            }
-            hypotheses.append(hypothesis)
+                confidence=_repeat_confidence(0.8, len(group)),
+                untested_assumptions=_RATE_LIMIT_ASSUMPTIONS
+            ))
         
         return hypotheses
     
@@ -359,7 +818,7 @@ class BusinessLogicAgent(BaseAgent):
         endpoint: str,
         successes: list[dict],
         failures: list[dict]
-    ) -> dict[str, Any] | None:
+    ) -> _RuleHypothesis | None:
         """
         Analyze if an endpoint has state dependencies.
         
@@ -375,81 +834,256 @@ class BusinessLogicAgent(BaseAgent):
         if not self.llm:
             return None
         
-        prompt = f"""Analyze these API interaction patterns for state dependencies:
-
-ENDPOINT: {endpoint}
-
-SUCCESSFUL REQUESTS ({len(successes)}):
-{json.dumps([{
-    'status': s.get('status_code'),
-    'action_before': s.get('ui_action', {}).get('action_type') if s.get('ui_action') else None
-} for s in successes[:3]], indent=2)}
-
-FAILED REQUESTS ({len(failures)}):
-{json.dumps([{
-    'status': f.get('status_code'),
-    'error': f.get('response_body', '')[:100],
-    'action_before': f.get('ui_action', {}).get('action_type') if f.get('ui_action') else None
-} for f in failures[:3]], indent=2)}
-
-Is there a state dependency? What prerequisite might be required?
-Respond with JSON including:
-- "has_dependency": boolean
-- "description": string explaining the rule
-- "prerequisite": what must happen first
-- "confidence": 0-1"""
+        cache_key = self._state_dependency_key(endpoint, successes, failures)
+        cached = self._cached_state_dependency(cache_key)
+        if cached is not None:
+            if cached.get("has_dependency"):
+                return self._create_state_transition_hypothesis(
+                    endpoint, successes, failures, cached
+                )
+            return None
+        
+        prompt = _STATE_DEPENDENCY_PROMPT.substitute(
+            section=self._format_state_dependency(endpoint, successes, failures)
+        )
 
         try:
             result = await self._invoke_llm_structured(
                 prompt=prompt,
-                output_schema={
-                    "type": "object",
-                    "properties": {
-                        "has_dependency": {"type": "boolean"},
-                        "description": {"type": "string"},
-                        "prerequisite": {"type": "string"},
-                        "confidence": {"type": "number"}
-                    }
-                },
+                output_schema=STATE_DEPENDENCY_OUTPUT_SCHEMA,
                 system_prompt=BUSINESS_LOGIC_PROMPT,
                 temperature=0.5
             )
+            self._store_state_dependency(cache_key, result)
             
             if result.get("has_dependency"):
-                return {
-                    "id": f"hyp_state_{hash(endpoint) % 100000}",
-                    "type": HypothesisType.STATE_TRANSITION.value,
-                    "description": result.get("description", f"State dependency on {endpoint}"),
-                    "rule_type": EnforcementRuleType.REQUIRED_SEQUENCE.value,
-                    "trigger_conditions": {
-                        "endpoint": endpoint,
-                        "prerequisite": result.get("prerequisite", "unknown")
-                    },
-                    "supporting_evidence": [
-                        {"observation_id": s.get("id"), "summary": "Successful request", "strength": "moderate"}
-                        for s in successes[:3]
-                    ] + [
-                        {"observation_id": f.get("id"), "summary": "Failed request", "strength": "moderate"}
-                        for f in failures[:3]
-                    ],
-                    "confidence": result.get("confidence", 0.5),
-                    "untested_assumptions": [
-                        "Sequence requirements not fully mapped",
-                        "May have additional prerequisites"
-                    ],
-                    "created_by": "business_logic"
-                }
+                return self._create_state_transition_hypothesis(
+                    endpoint, successes, failures, result
+                )
         except Exception as e:
             self.log(f"LLM analysis failed: {e}")
         
         return None
     
+    async def _analyze_state_dependencies_batch(
+        self,
+        candidates: list[tuple[str, list[dict], list[dict]]]
+    ) -> list[_RuleHypothesis | None]:
+        """
+        Analyze several endpoints for state dependencies in one LLM call.
+        
+        Args:
+            candidates: (endpoint, successes, failures) tuples
+            
+        Returns:
+            State transition hypothesis (or None) per candidate, in order
+        """
+        if not self.llm or not candidates:
+            return [None] * len(candidates)
+        
+        hypotheses: list[_RuleHypothesis | None] = [None] * len(candidates)
+        
+        # Serve repeat patterns from the cache; only misses go to the LLM
+        misses: list[tuple[int, bytes]] = []
+        for position, candidate in enumerate(candidates):
+            cache_key = self._state_dependency_key(*candidate)
+            cached = self._cached_state_dependency(cache_key)
+            if cached is None:
+                misses.append((position, cache_key))
+            elif cached.get("has_dependency"):
+                hypotheses[position] = self._create_state_transition_hypothesis(
+                    *candidate, cached
+                )
+        
+        if not misses:
+            return hypotheses
+        
+        if len(misses) == 1:
+            position = misses[0][0]
+            hypotheses[position] = await self._analyze_state_dependency(*candidates[position])
+            return hypotheses
+        
+        sections = [
+            f"[{index}] {self._format_state_dependency(*candidates[position])}"
+            for index, (position, _) in enumerate(misses, start=1)
+        ]
+        
+        prompt = _BATCH_STATE_DEPENDENCY_PROMPT.substitute(
+            count=len(misses),
+            sections="\n\n".join(sections)
+        )
+
+        try:
+            result = await self._invoke_llm_structured(
+                prompt=prompt,
+                output_schema=BATCH_STATE_DEPENDENCY_OUTPUT_SCHEMA,
+                system_prompt=BUSINESS_LOGIC_PROMPT,
+                temperature=0.5
+            )
+        except Exception as e:
+            self.log(f"Batched LLM analysis failed: {e}")
+            return hypotheses
+        
+        for entry in result.get("results", []):
+            try:
+                index = int(entry.get("index", 0)) - 1
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= index < len(misses):
+                continue
+            
+            position, cache_key = misses[index]
+            self._store_state_dependency(cache_key, entry)
+            if entry.get("has_dependency"):
+                hypotheses[position] = self._create_state_transition_hypothesis(
+                    *candidates[position], entry
+                )
+        
+        return hypotheses
+    
+    def _state_dependency_key(
+        self,
+        endpoint: str,
+        successes: list[dict],
+        failures: list[dict]
+    ) -> bytes:
+        """
+        Fingerprint an endpoint's success/failure pattern for caching.
+        Includes the endpoint's prerequisite hints, which the prompt also carries.
+        
+        Args:
+            endpoint: Endpoint URL
+            successes: Successful requests
+            failures: Failed requests
+            
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        status_counts = Counter(
+            obs.get("status_code") for obs in itertools.chain(successes, failures)
+        )
+        actions = tuple(
+            (obs.get("ui_action") or {}).get("action_type")
+            for obs in itertools.chain(successes[:3], failures[:3])
+        )
+        prerequisites = tuple(self._prerequisite_hints.get(endpoint, ()))
+        fingerprint = (endpoint, tuple(sorted(status_counts.items())), actions, prerequisites)
+        return hashlib.blake2b(repr(fingerprint).encode("utf-8"), digest_size=16).digest()
+    
+    def _cached_state_dependency(self, key: bytes) -> dict[str, Any] | None:
+        """
+        Look up a cached state-dependency analysis.
+        
+        Args:
+            key: Pattern fingerprint
+            
+        Returns:
+            Copy of the cached analysis, or None if missing or expired
+        """
+        entry = self._state_dependency_cache.get(key)
+        if entry is None:
+            return None
+        
+        expiry, analysis = entry
+        if expiry < time.monotonic():
+            del self._state_dependency_cache[key]
+            return None
+        
+        self._state_dependency_cache.move_to_end(key)
+        return dict(analysis)
+    
+    def _store_state_dependency(self, key: bytes, analysis: dict[str, Any]) -> None:
+        """
+        Cache a state-dependency analysis, evicting the least recently used.
+        
+        Args:
+            key: Pattern fingerprint
+            analysis: LLM analysis result
+        """
+        cache = self._state_dependency_cache
+        cache[key] = (time.monotonic() + STATE_DEPENDENCY_CACHE_TTL, dict(analysis))
+        cache.move_to_end(key)
+        while len(cache) > STATE_DEPENDENCY_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def _format_state_dependency(
+        self,
+        endpoint: str,
+        successes: list[dict],
+        failures: list[dict]
+    ) -> str:
+        """
+        Format one endpoint's success/failure evidence for a prompt.
+        
+        Args:
+            endpoint: Endpoint URL
+            successes: Successful requests
+            failures: Failed requests
+            
+        Returns:
+            Prompt section text
+        """
+        return _STATE_DEPENDENCY_SECTION.substitute(
+            endpoint=endpoint,
+            success_count=len(successes),
+            successes=json_dumps([{
+                'status': s.get('status_code'),
+                'action_before': s.get('ui_action', {}).get('action_type') if s.get('ui_action') else None
+            } for s in successes[:3]]),
+            failure_count=len(failures),
+            failures=json_dumps([{
+                'status': f.get('status_code'),
+                'error': f.get('_body_200', '')[:100],
+                'action_before': f.get('ui_action', {}).get('action_type') if f.get('ui_action') else None
+            } for f in failures[:3]]),
+            prerequisites=json_dumps(self._prerequisite_hints.get(endpoint, []))
+        )
+    
+    def _create_state_transition_hypothesis(
+        self,
+        endpoint: str,
+        successes: list[dict],
+        failures: list[dict],
+        result: dict[str, Any]
+    ) -> _RuleHypothesis:
+        """
+        Create a state transition hypothesis from an LLM analysis result.
+        
+        Args:
+            endpoint: Endpoint URL
+            successes: Successful requests
+            failures: Failed requests
+            result: LLM analysis (description, prerequisite, confidence)
+            
+        Returns:
+            State transition hypothesis
+        """
+        return _RuleHypothesis(
+            id=self._make_id("hyp_state", endpoint),
+            type=HypothesisType.STATE_TRANSITION.value,
+            description=result.get("description", f"State dependency on {endpoint}"),
+            rule_type=EnforcementRuleType.REQUIRED_SEQUENCE.value,
+            trigger_conditions={
+                "endpoint": endpoint,
+                "prerequisite": result.get("prerequisite", "unknown")
+            },
+            supporting_evidence=[
+                {"observation_id": s.get("id"), "summary": "Successful request", "strength": "moderate"}
+                for s in successes[:3]
+            ] + [
+                {"observation_id": f.get("id"), "summary": "Failed request", "strength": "moderate"}
+                for f in failures[:3]
+            ],
+            confidence=result.get("confidence", 0.5),
+            untested_assumptions=_STATE_TRANSITION_ASSUMPTIONS
+        )
+    
     def _create_enforcement_hypothesis(
         self,
         obs: dict[str, Any],
         status: int,
         error_msg: str
-    ) -> dict[str, Any] | None:
+    ) -> _RuleHypothesis:
         """
         Create an enforcement rule hypothesis from an error.
         
@@ -459,48 +1093,50 @@ Respond with JSON including:
             error_msg: Error message
             
         Returns:
-            Hypothesis dict or None
+            Enforcement rule hypothesis
         """
         url = obs.get("url", "")
         
-        # Detect constraint type from error message
-        error_lower = error_msg.lower()
+        # Slice the (possibly large) message once; shorter cuts come from this
+        error_200 = error_msg[:200]
+        error_100 = error_200[:100]
+        error_50 = error_100[:50]
         
-        if any(word in error_lower for word in ["required", "missing", "empty"]):
-            rule_type = EnforcementRuleType.FIELD_CONSTRAINT
-            desc = f"Endpoint {url} has required field validation"
-        elif any(word in error_lower for word in ["invalid", "format", "type"]):
-            rule_type = EnforcementRuleType.FIELD_CONSTRAINT
-            desc = f"Endpoint {url} has field format validation"
-        elif any(word in error_lower for word in ["sequence", "first", "before", "must"]):
-            rule_type = EnforcementRuleType.REQUIRED_SEQUENCE
-            desc = f"Endpoint {url} requires prerequisite action"
+        # Detect constraint type from error message in a single scan,
+        # keeping the highest-priority keyword kind seen
+        best = None
+        for match in _CONSTRAINT_RE.finditer(error_msg):
+            rule = _CONSTRAINT_RULES[match.lastgroup]
+            if best is None or rule[0] < best[0]:
+                best = rule
+                if rule[0] == 0:
+                    break
+        
+        if best is not None:
+            _, rule_type, summary = best
+            desc = f"Endpoint {url} {summary}"
         else:
             rule_type = EnforcementRuleType.FIELD_CONSTRAINT
-            desc = f"Endpoint {url} rejected request: {error_msg[:50]}"
+            desc = f"Endpoint {url} rejected request: {error_50}"
         
-        return {
-            "id": f"hyp_enforce_{hash(url + error_msg) % 100000}",
-            "type": HypothesisType.BUSINESS_RULE.value,
-            "description": desc,
-            "rule_type": rule_type.value,
-            "trigger_conditions": {
+        return _RuleHypothesis(
+            id=self._make_id("hyp_enforce", url, error_msg),
+            type=HypothesisType.BUSINESS_RULE.value,
+            description=desc,
+            rule_type=rule_type.value,
+            trigger_conditions={
                 "endpoint": url,
-                "error_pattern": error_msg[:100]
+                "error_pattern": error_100
             },
-            "observed_response": {
+            observed_response={
                 "status": status,
-                "error": error_msg[:200]
+                "error": error_200
             },
-            "supporting_evidence": [{
+            supporting_evidence=[{
                 "observation_id": obs.get("id"),
-                "summary": f"{status} error: {error_msg[:50]}",
+                "summary": f"{status} error: {error_50}",
                 "strength": "strong"
             }],
-            "confidence": 0.6,
-            "untested_assumptions": [
-                "Error message may not fully describe constraint",
-                "Validation rules may be request-specific"
-            ],
-            "created_by": "business_logic"
-        }
+            confidence=0.6,
+            untested_assumptions=_ENFORCEMENT_ASSUMPTIONS
+        )
@@ -4,12 +4,20 @@ Challenges every hypothesis, enumerates alternatives, and prevents hallucination
 This agent is CRITICAL for ensuring scientific rigor.
 """
 
-import json
+import asyncio
+import hashlib
+import itertools
+import string
+from collections import Counter, OrderedDict, defaultdict
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 from .base import BaseAgent
+from ..core.config import settings
 from ..core.state import AgentState
 from ..core.models import CriticVerdict, ProbeType
+from ..utils.json_codec import json_dumps, json_loads
 
 
 # Critic system prompt - designed to be skeptical
@@ -94,6 +102,145 @@ CRITIC_OUTPUT_SCHEMA = {
     "required": ["verdict", "recommended_confidence", "adjustment_reason"]
 }
 
+# Output constraints derived once from CRITIC_OUTPUT_SCHEMA, used to
+# normalize every evaluation without re-walking the schema
+_VERDICTS = frozenset(CRITIC_OUTPUT_SCHEMA["properties"]["verdict"]["enum"])
+_CONFIDENCE_MIN = float(CRITIC_OUTPUT_SCHEMA["properties"]["recommended_confidence"]["minimum"])
+_CONFIDENCE_MAX = float(CRITIC_OUTPUT_SCHEMA["properties"]["recommended_confidence"]["maximum"])
+_PROBING_VERDICTS = frozenset({"challenge", "reject"})
+
+# Evaluation prompt scaffold; rule/schema blocks are empty when absent
+_EVALUATION_PROMPT = string.Template("""HYPOTHESIS UNDER REVIEW:
+
+TYPE: $hyp_type
+DESCRIPTION: $description
+CURRENT CONFIDENCE: $confidence
+$rule
+$schema
+
+SUPPORTING EVIDENCE:
+$evidence
+
+EXISTING COMPETING EXPLANATIONS:
+$competing
+
+UNTESTED ASSUMPTIONS NOTED:
+$assumptions
+
+---
+
+Your task: CRITICALLY evaluate this hypothesis. Find weaknesses, alternative explanations, and missing evidence.
+Remember to apply the scoring rules strictly. Be skeptical.""")
+
+# Default probe templates, copied per use so callers may mutate them
+_REPLAY_PROBE = {
+    "probe_type": ProbeType.REPLAY_EXACT.value,
+    "expected_outcome": "Same response structure"
+}
+_OMIT_FIELD_PROBE = {
+    "probe_type": ProbeType.OMIT_FIELD.value,
+    "description": "Test with missing optional fields",
+    "expected_outcome": "Success with defaults or validation error"
+}
+_NO_AUTH_PROBE = {
+    "probe_type": ProbeType.AUTH_VARIATION.value,
+    "description": "Test without authentication",
+    "expected_outcome": "401 if auth required, else same response"
+}
+_SEQUENCE_BREAK_PROBE = {
+    "probe_type": ProbeType.SEQUENCE_BREAK.value,
+    "description": "Test by skipping prerequisite steps",
+    "expected_outcome": "Error if sequence is enforced"
+}
+_AUTH_LEVELS_PROBE = {
+    "probe_type": ProbeType.AUTH_VARIATION.value,
+    "description": "Test with different auth levels",
+    "expected_outcome": "Different responses based on permission"
+}
+
+# Reviews reused for structurally identical hypotheses (LRU-bounded)
+REVIEW_CACHE_SIZE = 512
+
+# Hypothesis fields that determine a review; anything else is bookkeeping
+_REVIEW_KEY_FIELDS = (
+    "type", "description", "endpoint_pattern", "method", "rule_type",
+    "trigger_conditions", "response_schema", "confidence"
+)
+
+# Prefix of adjustment_reason on error reviews
+_ERROR_REASON_PREFIX = "Evaluation error: "
+
+# Static part of every error review; list members are shared, read-only
+_ERROR_REVIEW_TEMPLATE = MappingProxyType({
+    "hypothesis_id": "unknown",
+    "verdict": "challenge",
+    "alternative_explanations": ["Unable to fully evaluate - treat with caution"],
+    "untested_assumptions": ["Evaluation incomplete due to error"],
+    "missing_evidence": ["Need manual review"],
+    "contradictions": [],
+    "original_confidence": 0.5,
+    "recommended_confidence": 0.3,
+    "adjustment_reason": _ERROR_REASON_PREFIX,
+    "required_probes": [],
+    "required_exploration": []
+})
+
+def _copy_review(review: dict[str, Any], **overrides: Any) -> dict[str, Any]:
+    """
+    Copy a review deep enough that its probes can be mutated independently.
+    
+    Args:
+        review: Review to copy
+        **overrides: Top-level fields to replace in the copy
+        
+    Returns:
+        Review copy with fresh required_probes dicts
+    """
+    return dict(
+        review,
+        required_probes=[dict(p) for p in review.get("required_probes", [])],
+        **overrides
+    )
+
+
+# Fallback scoring: (max evidence count, confidence cap, verdict).
+# A None verdict means accept if current confidence >= 0.6, else challenge.
+_FALLBACK_TABLE = (
+    (1, 0.3, "challenge"),
+    (3, 0.5, "challenge"),
+    (float("inf"), 0.7, None),
+)
+
+
+@lru_cache(maxsize=512)
+def _indented_excerpt(compact: str, limit: int) -> str:
+    """
+    Pretty-print a compact JSON document and truncate it, memoized.
+    
+    Args:
+        compact: Compact JSON text (acts as the cache key)
+        limit: Maximum length of the result
+        
+    Returns:
+        Indented JSON prefix
+    """
+    return json_dumps(json_loads(compact), indent=True)[:limit]
+
+
+def _json_excerpt(value: Any, limit: int) -> str:
+    """
+    Indented, truncated JSON for a prompt field.
+    Structurally equal values (e.g. shared schemas) hit the same cache entry.
+    
+    Args:
+        value: JSON-serializable value
+        limit: Maximum length of the result
+        
+    Returns:
+        Indented JSON prefix
+    """
+    return _indented_excerpt(json_dumps(value), limit)
+
 
 class CriticAgent(BaseAgent):
     """
@@ -109,6 +256,12 @@ class CriticAgent(BaseAgent):
             **kwargs: Passed to BaseAgent
         """
         super().__init__(name="critic", **kwargs)
+        
+        # Bounds concurrent critique calls to the LLM provider
+        self._llm_semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+        
+        # Review fingerprint -> review, shared across execute() calls
+        self._review_cache: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
     
     async def execute(self, state: AgentState) -> dict[str, Any]:
         """
@@ -126,43 +279,193 @@ class CriticAgent(BaseAgent):
             self.log("No hypotheses to critique")
             return {
                 "critic_reviews": [],
+                "probes_pending": False,
+                "exploration_pending": False,
                 "messages": [self.create_message("No hypotheses to review")]
             }
         
         self.log(f"Reviewing {len(hypotheses)} hypotheses")
         
-        reviews = []
-        for hypothesis in hypotheses:
-            try:
-                review = await self._evaluate_hypothesis(hypothesis)
-                reviews.append(review)
-            except Exception as e:
-                self.log(f"Error reviewing hypothesis: {e}")
-                # Create a cautionary review
-                reviews.append(self._create_error_review(hypothesis, str(e)))
+        # Only critique one representative per distinct, uncached hypothesis
+        keys = [self._review_key(h) for h in hypotheses]
+        known: dict[bytes, dict[str, Any]] = {}
+        unique: dict[bytes, dict[str, Any]] = {}
+        for key, hypothesis in zip(keys, hypotheses):
+            if key in known or key in unique:
+                continue
+            cached = self._review_cache.get(key)
+            if cached is not None:
+                self._review_cache.move_to_end(key)
+                known[key] = cached
+            else:
+                unique[key] = hypothesis
         
-        # Summarize verdicts
-        verdicts = [r.get("verdict", "unknown") for r in reviews]
+        if unique:
+            self.log(
+                "Critiquing %d distinct hypotheses (%d reused)",
+                len(unique), len(hypotheses) - len(unique)
+            )
+            if self.llm:
+                fresh = await self._review_with_llm(list(unique.values()))
+            else:
+                fresh = self._review_offline(list(unique.values()))
+            # Error reviews and LLM-failure fallbacks are retried next run, not cached
+            for key, (review, cacheable) in zip(unique, fresh):
+                known[key] = review
+                if cacheable:
+                    self._store_review(key, review)
+        
+        reviews = [
+            self._review_for(hypothesis, known[key])
+            for key, hypothesis in zip(keys, hypotheses)
+        ]
+        
+        # Summarize verdicts and routing needs in one pass
+        verdicts = Counter()
+        probes_pending = exploration_pending = False
+        for r in reviews:
+            verdicts[r.get("verdict", "unknown")] += 1
+            if not probes_pending and r.get("required_probes"):
+                probes_pending = True
+            if not exploration_pending and r.get("required_exploration"):
+                exploration_pending = True
+
+        accepted = verdicts["accept"]
+        challenged = verdicts["challenge"]
+        rejected = verdicts["reject"]
         self.log(
-            f"Reviews complete: {verdicts.count('accept')} accepted, "
-            f"{verdicts.count('challenge')} challenged, "
-            f"{verdicts.count('reject')} rejected"
+            "Reviews complete: %d accepted, %d challenged, %d rejected",
+            accepted, challenged, rejected
         )
         
         return {
             "critic_reviews": reviews,
+            "probes_pending": probes_pending,
+            "exploration_pending": exploration_pending,
             "messages": [self.create_message(
                 f"Reviewed {len(hypotheses)} hypotheses: "
-                f"{verdicts.count('accept')} accepted, "
-                f"{verdicts.count('challenge')} challenged, "
-                f"{verdicts.count('reject')} rejected"
+                f"{accepted} accepted, {challenged} challenged, {rejected} rejected"
             )]
         }
     
+    def _review_key(self, hypothesis: dict[str, Any]) -> bytes:
+        """
+        Fingerprint the parts of a hypothesis a review depends on.
+        
+        Args:
+            hypothesis: Hypothesis to fingerprint
+            
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        fields = [hypothesis.get(name) for name in _REVIEW_KEY_FIELDS]
+        fields.append(len(hypothesis.get("supporting_evidence") or ()))
+        encoded = json_dumps(fields, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).digest()
+    
+    def _store_review(self, key: bytes, review: dict[str, Any]) -> None:
+        """
+        Cache a private copy of a review, evicting the least recently used.
+        
+        Args:
+            key: Hypothesis fingerprint
+            review: Completed review
+        """
+        cache = self._review_cache
+        cache[key] = _copy_review(review)
+        cache.move_to_end(key)
+        while len(cache) > REVIEW_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def _review_for(
+        self,
+        hypothesis: dict[str, Any],
+        review: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Re-target a shared review at a specific hypothesis.
+        
+        Args:
+            hypothesis: Hypothesis the review is reported for
+            review: Review of an identical hypothesis
+            
+        Returns:
+            Copy of the review carrying this hypothesis's ID and confidence,
+            with its own probe dicts (the verifier tags them in place)
+        """
+        return _copy_review(
+            review,
+            hypothesis_id=hypothesis.get("id", "unknown"),
+            original_confidence=hypothesis.get("confidence", 0.5)
+        )
+    
+    async def _review_with_llm(
+        self,
+        hypotheses: list[dict[str, Any]]
+    ) -> list[tuple[dict[str, Any], bool]]:
+        """
+        Review hypotheses with concurrent LLM critiques.
+        
+        Args:
+            hypotheses: Hypotheses to review
+            
+        Returns:
+            (review, cacheable) pairs in hypothesis order
+        """
+        # Critiques are independent; run them concurrently
+        async def run(hypothesis):
+            async with self._llm_semaphore:
+                return await self._evaluate_hypothesis(hypothesis)
+        
+        results = await asyncio.gather(
+            *(run(h) for h in hypotheses),
+            return_exceptions=True
+        )
+        
+        reviews = []
+        for hypothesis, result in zip(hypotheses, results):
+            if isinstance(result, Exception):
+                self.log(f"Error reviewing hypothesis: {result}")
+                # Create a cautionary review
+                reviews.append((self._create_error_review(hypothesis, str(result)), False))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                reviews.append(result)
+        
+        return reviews
+    
+    def _review_offline(
+        self,
+        hypotheses: list[dict[str, Any]]
+    ) -> list[tuple[dict[str, Any], bool]]:
+        """
+        Review hypotheses with the rule-based fallback only.
+        Runs inline: no prompts, tasks or semaphore for pure dict work.
+        
+        Args:
+            hypotheses: Hypotheses to review
+            
+        Returns:
+            (review, cacheable) pairs in hypothesis order
+        """
+        reviews = []
+        for hypothesis in hypotheses:
+            try:
+                reviews.append((self._finalize_evaluation(
+                    hypothesis, self._fallback_evaluation(hypothesis)
+                ), True))
+            except Exception as e:
+                self.log(f"Error reviewing hypothesis: {e}")
+                # Create a cautionary review
+                reviews.append((self._create_error_review(hypothesis, str(e)), False))
+        
+        return reviews
+    
     async def _evaluate_hypothesis(
         self,
         hypothesis: dict[str, Any]
-    ) -> dict[str, Any]:
+    ) -> tuple[dict[str, Any], bool]:
         """
         Critically evaluate a single hypothesis.
         
@@ -170,13 +473,14 @@ class CriticAgent(BaseAgent):
             hypothesis: Hypothesis to evaluate
             
         Returns:
-            Evaluation dictionary
+            Tuple of (evaluation dictionary, cacheable). Heuristic
+            fallbacks substituted for a failed LLM call are not cacheable.
         """
-        # Build evaluation prompt
-        prompt = self._build_evaluation_prompt(hypothesis)
+        cacheable = True
         
         # Get LLM critique
         if self.llm:
+            prompt = self._build_evaluation_prompt(hypothesis)
             try:
                 evaluation = await self._invoke_llm_structured(
                     prompt=prompt,
@@ -187,25 +491,43 @@ class CriticAgent(BaseAgent):
             except Exception as e:
                 self.log(f"LLM evaluation failed: {e}")
                 evaluation = self._fallback_evaluation(hypothesis)
+                cacheable = False
         else:
             evaluation = self._fallback_evaluation(hypothesis)
         
+        return self._finalize_evaluation(hypothesis, evaluation), cacheable
+    
+    def _finalize_evaluation(
+        self,
+        hypothesis: dict[str, Any],
+        evaluation: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Attach hypothesis references and normalize an evaluation.
+        
+        Args:
+            hypothesis: Evaluated hypothesis
+            evaluation: Raw LLM or fallback evaluation
+            
+        Returns:
+            Evaluation dictionary
+        """
         # Add hypothesis reference
         evaluation["hypothesis_id"] = hypothesis.get("id", "unknown")
         evaluation["original_confidence"] = hypothesis.get("confidence", 0.5)
         
         # Ensure verdict is valid
-        if evaluation.get("verdict") not in ["accept", "challenge", "reject"]:
+        if evaluation.get("verdict") not in _VERDICTS:
             evaluation["verdict"] = "challenge"
         
         # Ensure confidence is bounded
         evaluation["recommended_confidence"] = max(
-            0.0, 
-            min(1.0, evaluation.get("recommended_confidence", 0.3))
+            _CONFIDENCE_MIN,
+            min(_CONFIDENCE_MAX, evaluation.get("recommended_confidence", 0.3))
         )
         
         # Generate required probes if challenging
-        if evaluation["verdict"] in ["challenge", "reject"]:
+        if evaluation["verdict"] in _PROBING_VERDICTS:
             if not evaluation.get("required_probes"):
                 evaluation["required_probes"] = self._generate_default_probes(hypothesis)
         
@@ -231,9 +553,11 @@ class CriticAgent(BaseAgent):
         evidence_str = ""
         if evidence:
             evidence_items = []
-            for e in evidence[:5]:  # Limit to 5
+            for e in itertools.islice(evidence, 5):  # Limit to 5
                 if isinstance(e, dict):
                     evidence_items.append(f"  - {e.get('summary', 'No summary')}")
+                elif isinstance(e, str):
+                    evidence_items.append(f"  - {e[:100]}")
                 else:
                     evidence_items.append(f"  - {str(e)[:100]}")
             evidence_str = "\n".join(evidence_items)
@@ -243,38 +567,25 @@ class CriticAgent(BaseAgent):
         # Format schema if present
         schema_str = ""
         if hypothesis.get("response_schema"):
-            schema_str = f"\nRESPONSE SCHEMA:\n```json\n{json.dumps(hypothesis['response_schema'], indent=2)[:500]}\n```"
+            schema_str = f"\nRESPONSE SCHEMA:\n```json\n{_json_excerpt(hypothesis['response_schema'], 500)}\n```"
         
         # Format business rule if present
         rule_str = ""
         if hypothesis.get("rule_type"):
             rule_str = f"\nRULE TYPE: {hypothesis.get('rule_type')}"
             if hypothesis.get("trigger_conditions"):
-                rule_str += f"\nTRIGGER: {json.dumps(hypothesis.get('trigger_conditions'))[:200]}"
+                rule_str += f"\nTRIGGER: {json_dumps(hypothesis.get('trigger_conditions'))[:200]}"
         
-        prompt = f"""HYPOTHESIS UNDER REVIEW:
-
-TYPE: {hyp_type}
-DESCRIPTION: {description}
-CURRENT CONFIDENCE: {confidence}
-{rule_str}
-{schema_str}
-
-SUPPORTING EVIDENCE:
-{evidence_str}
-
-EXISTING COMPETING EXPLANATIONS:
-{json.dumps(hypothesis.get('competing_explanations', []), indent=2)[:300]}
-
-UNTESTED ASSUMPTIONS NOTED:
-{json.dumps(hypothesis.get('untested_assumptions', []), indent=2)[:300]}
-
----
-
-Your task: CRITICALLY evaluate this hypothesis. Find weaknesses, alternative explanations, and missing evidence.
-Remember to apply the scoring rules strictly. Be skeptical."""
-
-        return prompt
+        return _EVALUATION_PROMPT.substitute(
+            hyp_type=hyp_type,
+            description=description,
+            confidence=confidence,
+            rule=rule_str,
+            schema=schema_str,
+            evidence=evidence_str,
+            competing=_json_excerpt(hypothesis.get('competing_explanations', []), 300),
+            assumptions=_json_excerpt(hypothesis.get('untested_assumptions', []), 300)
+        )
     
     def _fallback_evaluation(self, hypothesis: dict[str, Any]) -> dict[str, Any]:
         """
@@ -290,14 +601,11 @@ Remember to apply the scoring rules strictly. Be skeptical."""
         current_conf = hypothesis.get("confidence", 0.5)
         
         # Apply basic scoring rules
-        if evidence_count <= 1:
-            recommended = min(current_conf, 0.3)
-            verdict = "challenge"
-        elif evidence_count <= 3:
-            recommended = min(current_conf, 0.5)
-            verdict = "challenge"
-        else:
-            recommended = min(current_conf, 0.7)
+        for threshold, cap, verdict in _FALLBACK_TABLE:
+            if evidence_count <= threshold:
+                break
+        recommended = min(current_conf, cap)
+        if verdict is None:
             verdict = "accept" if current_conf >= 0.6 else "challenge"
         
         return {
@@ -342,40 +650,23 @@ Remember to apply the scoring rules strictly. Be skeptical."""
             method = hypothesis.get("method", "GET")
             
             # Replay probe
-            probes.append({
-                "probe_type": ProbeType.REPLAY_EXACT.value,
-                "description": f"Replay {method} {endpoint} to confirm consistency",
-                "expected_outcome": "Same response structure"
-            })
+            probes.append(dict(
+                _REPLAY_PROBE,
+                description=f"Replay {method} {endpoint} to confirm consistency"
+            ))
             
             # Boundary probe for POST/PUT
             if method in ("POST", "PUT", "PATCH"):
-                probes.append({
-                    "probe_type": ProbeType.OMIT_FIELD.value,
-                    "description": "Test with missing optional fields",
-                    "expected_outcome": "Success with defaults or validation error"
-                })
+                probes.append(dict(_OMIT_FIELD_PROBE))
             
             # Auth variation
-            probes.append({
-                "probe_type": ProbeType.AUTH_VARIATION.value,
-                "description": "Test without authentication",
-                "expected_outcome": "401 if auth required, else same response"
-            })
+            probes.append(dict(_NO_AUTH_PROBE))
         
         elif hyp_type in ("business_rule", "state_transition"):
-            probes.append({
-                "probe_type": ProbeType.SEQUENCE_BREAK.value,
-                "description": "Test by skipping prerequisite steps",
-                "expected_outcome": "Error if sequence is enforced"
-            })
+            probes.append(dict(_SEQUENCE_BREAK_PROBE))
         
         elif hyp_type == "permission_gate":
-            probes.append({
-                "probe_type": ProbeType.AUTH_VARIATION.value,
-                "description": "Test with different auth levels",
-                "expected_outcome": "Different responses based on permission"
-            })
+            probes.append(dict(_AUTH_LEVELS_PROBE))
         
         return probes
     
@@ -394,19 +685,11 @@ Remember to apply the scoring rules strictly. Be skeptical."""
         Returns:
             Cautionary review
         """
-        return {
-            "hypothesis_id": hypothesis.get("id", "unknown"),
-            "verdict": "challenge",
-            "alternative_explanations": ["Unable to fully evaluate - treat with caution"],
-            "untested_assumptions": ["Evaluation incomplete due to error"],
-            "missing_evidence": ["Need manual review"],
-            "contradictions": [],
-            "original_confidence": hypothesis.get("confidence", 0.5),
-            "recommended_confidence": 0.3,
-            "adjustment_reason": f"Evaluation error: {error}",
-            "required_probes": [],
-            "required_exploration": []
-        }
+        review = dict(_ERROR_REVIEW_TEMPLATE)
+        review["hypothesis_id"] = hypothesis.get("id", "unknown")
+        review["original_confidence"] = hypothesis.get("confidence", 0.5)
+        review["adjustment_reason"] = f"{_ERROR_REASON_PREFIX}{error}"
+        return review
     
     async def find_contradictions(
         self,
@@ -423,26 +706,32 @@ Remember to apply the scoring rules strictly. Be skeptical."""
         """
         contradictions = []
         
-        # Check each pair
-        for i, h1 in enumerate(hypotheses):
-            for h2 in hypotheses[i + 1:]:
-                # Same endpoint with conflicting schemas
-                if (h1.get("endpoint_pattern") == h2.get("endpoint_pattern") and
-                    h1.get("type") == "endpoint_schema" and
-                    h2.get("type") == "endpoint_schema"):
-                    
-                    if h1.get("method") == h2.get("method"):
+        # Group candidates so only hypotheses that can conflict are paired:
+        # schemas by (endpoint, method), permission gates by endpoint
+        groups: dict[tuple, list[dict[str, Any]]] = defaultdict(list)
+        for h in hypotheses:
+            hyp_type = h.get("type")
+            if hyp_type == "endpoint_schema":
+                groups[(hyp_type, h.get("endpoint_pattern"), h.get("method"))].append(h)
+            elif hyp_type == "permission_gate":
+                groups[(hyp_type, h.get("endpoint_pattern"))].append(h)
+        
+        for key, group in groups.items():
+            if len(group) < 2:
+                continue
+            
+            for i, h1 in enumerate(group):
+                for h2 in group[i + 1:]:
+                    # Same endpoint with conflicting schemas
+                    if key[0] == "endpoint_schema":
                         contradictions.append((
                             h1.get("id"),
                             h2.get("id"),
                             f"Conflicting schemas for {h1.get('endpoint_pattern')}"
                         ))
-                
-                # Conflicting permission requirements
-                if (h1.get("type") == "permission_gate" and
-                    h2.get("type") == "permission_gate" and
-                    h1.get("endpoint_pattern") == h2.get("endpoint_pattern")):
+                        continue
                     
+                    # Conflicting permission requirements
                     req1 = h1.get("trigger_conditions", {}).get("requirement")
                     req2 = h2.get("trigger_conditions", {}).get("requirement")
                     
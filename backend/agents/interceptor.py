@@ -3,15 +3,41 @@ Interceptor Agent - The Observer.
 Captures network traffic and correlates requests to UI actions.
 """
 
+import re
 import time
+from collections import Counter
 from typing import Any, Callable, Awaitable
 from uuid import uuid4
 
+from pydantic import TypeAdapter
+
 from .base import BaseAgent
 from ..core.state import AgentState
 from ..core.models import NetworkObservation, ActionRecord
 
 
+# Static asset extensions, checked against the URL path suffix only
+_STATIC_SUFFIXES = (
+    '.js', '.css', '.png', '.jpg', '.gif', '.svg',
+    '.woff', '.woff2', '.ico', '.webp', '.mp4', '.mp3'
+)
+_STATIC_SUFFIX_SPAN = max(len(suffix) for suffix in _STATIC_SUFFIXES)
+
+# URL filters for _is_relevant_api_call (case-insensitive, so the URL
+# never needs lowercasing)
+_TRACKER_RE = re.compile(
+    r"google-analytics|googletagmanager|facebook|hotjar|mixpanel|segment|doubleclick",
+    re.IGNORECASE
+)
+_API_PATH_RE = re.compile(r"/(?:api|v1|v2|rest|data)/|/graphql", re.IGNORECASE)
+
+# API key header names, highest precedence first
+_API_KEY_HEADERS = ('apikey', 'api-key', 'x-api-key')
+
+# Serializes a whole batch of observations in one pydantic-core call
+_OBSERVATIONS_ADAPTER = TypeAdapter(list[NetworkObservation])
+
+
 class InterceptorAgent(BaseAgent):
     """
     Interceptor Agent for network traffic capture.
@@ -52,37 +78,29 @@ class InterceptorAgent(BaseAgent):
         """
         self.log(f"Processing {len(self.pending_observations)} observations")
         
-        # Get observations from this iteration
-        observations = self._get_and_clear_observations()
-        
-        # Filter to relevant API traffic
+        # Drain this iteration's observations and keep relevant API traffic;
+        # the drained buffer is never bound, so non-API entries are freed
+        # before the batch is serialized
+        is_relevant = self._is_relevant_api_call
         api_observations = [
-            obs for obs in observations
-            if self._is_relevant_api_call(obs)
+            obs for obs in self._get_and_clear_observations()
+            if is_relevant(obs)
         ]
+        count = len(api_observations)
         
-        self.log(f"Found {len(api_observations)} API calls")
+        self.log(f"Found {count} API calls")
         
         # Convert to dicts for state
-        obs_dicts = [obs.model_dump() for obs in api_observations]
+        obs_dicts = _OBSERVATIONS_ADAPTER.dump_python(api_observations)
+        del api_observations
         
         return {
             "new_observations": obs_dicts,
             "messages": [self.create_message(
-                f"Captured {len(api_observations)} API observations"
+                f"Captured {count} API observations"
             )]
         }
     
-    def create_message(self, content: str) -> dict[str, Any]:
-        """Override to work without LLM."""
-        from datetime import datetime
-        return {
-            "role": "assistant",
-            "content": content,
-            "name": self.name,
-            "timestamp": datetime.now().isoformat()
-        }
-    
     def add_observation(self, observation: NetworkObservation) -> None:
         """
         Add an observation to pending queue.
@@ -99,8 +117,9 @@ class InterceptorAgent(BaseAgent):
         Returns:
             List of pending observations
         """
-        observations = self.pending_observations.copy()
-        self.pending_observations = []
+        # Hand off the buffer and start a fresh one; no copy needed since
+        # observations are appended from the same event loop
+        observations, self.pending_observations = self.pending_observations, []
         return observations
     
     def _is_relevant_api_call(self, obs: NetworkObservation) -> bool:
@@ -113,35 +132,24 @@ class InterceptorAgent(BaseAgent):
         Returns:
             True if relevant
         """
-        url = obs.url.lower()
+        url = obs.url
         
         # Must have response
         if obs.status_code == 0:
             return False
         
-        # Skip static assets
-        static_patterns = [
-            '.js', '.css', '.png', '.jpg', '.gif', '.svg',
-            '.woff', '.ico', '.webp', '.mp4', '.mp3'
-        ]
-        for pattern in static_patterns:
-            if pattern in url:
-                return False
+        # Skip static assets (extension of the path, ignoring query/fragment)
+        path = url.partition('?')[0].partition('#')[0]
+        if path[-_STATIC_SUFFIX_SPAN:].lower().endswith(_STATIC_SUFFIXES):
+            return False
         
         # Skip tracking
-        trackers = [
-            'google-analytics', 'googletagmanager', 'facebook',
-            'hotjar', 'mixpanel', 'segment', 'doubleclick'
-        ]
-        for tracker in trackers:
-            if tracker in url:
-                return False
+        if _TRACKER_RE.search(url):
+            return False
         
         # Check for API patterns
-        api_patterns = ['/api/', '/v1/', '/v2/', '/graphql', '/rest/', '/data/']
-        for pattern in api_patterns:
-            if pattern in url:
-                return True
+        if _API_PATH_RE.search(url):
+            return True
         
         # Check content type
         content_type = obs.response_headers.get('content-type', '').lower()
@@ -194,28 +202,17 @@ class InterceptorAgent(BaseAgent):
         """
         observations = self.pending_observations
         
-        # Group by URL pattern
-        url_counts: dict[str, int] = {}
-        method_counts: dict[str, int] = {}
-        status_counts: dict[int, int] = {}
-        
-        for obs in observations:
-            # Count by URL (simplified)
-            base_url = obs.url.split('?')[0]
-            url_counts[base_url] = url_counts.get(base_url, 0) + 1
-            
-            # Count by method
-            method_counts[obs.method] = method_counts.get(obs.method, 0) + 1
-            
-            # Count by status
-            status_counts[obs.status_code] = status_counts.get(obs.status_code, 0) + 1
+        # Count by URL (simplified), method and status
+        url_counts = Counter(obs.url.partition('?')[0] for obs in observations)
+        method_counts = Counter(obs.method for obs in observations)
+        status_counts = Counter(obs.status_code for obs in observations)
         
         return {
             "total": len(observations),
             "unique_urls": len(url_counts),
-            "by_method": method_counts,
-            "by_status": status_counts,
-            "top_urls": sorted(url_counts.items(), key=lambda x: -x[1])[:10]
+            "by_method": dict(method_counts),
+            "by_status": dict(status_counts),
+            "top_urls": url_counts.most_common(10)
         }
     
     def extract_auth_tokens(self) -> dict[str, str]:
@@ -228,17 +225,19 @@ class InterceptorAgent(BaseAgent):
         tokens: dict[str, str] = {}
         
         for obs in self.pending_observations:
-            headers = obs.request_headers
+            # Normalize header names once per request
+            headers = {k.lower(): v for k, v in obs.request_headers.items()}
             
             # Check for Bearer token
-            auth_header = headers.get('authorization', headers.get('Authorization', ''))
+            auth_header = headers.get('authorization', '')
             if auth_header.startswith('Bearer '):
                 tokens['bearer'] = auth_header[7:]
             
             # Check for API key
-            for key in ['x-api-key', 'api-key', 'apikey']:
+            for key in _API_KEY_HEADERS:
                 if key in headers:
                     tokens['api_key'] = headers[key]
+                    break
             
             # Check cookies for session tokens
             cookie = headers.get('cookie', '')
@@ -3,13 +3,19 @@ Navigator Agent - The Explorer.
 Systematically traverses the UI to maximize state coverage and trigger API interactions.
 """
 
+import hashlib
 import json
+import random
+import string
+from collections import OrderedDict, defaultdict, deque
+from functools import lru_cache
 from typing import Any
 
 from .base import BaseAgent
 from ..core.state import AgentState
 from ..core.models import ActionRecord, FrontierItem
 from ..memory.scratchpad import NavigatorScratchpad
+from ..utils.hashing import content_digest
 
 
 # Navigator system prompt
@@ -148,6 +154,94 @@ NAVIGATOR_TOOLS = [
 ]
 
 
+# Decisions reused when page, DOM and exploration memo repeat exactly
+NAVIGATOR_RESPONSE_CACHE_SIZE = 256
+
+# Prefix of _execute_tool_call results for failed actions (never cached)
+_TOOL_FAILURE_PREFIX = "Failed to execute"
+
+# State-changing actions are never replayed from the decision cache
+_NO_CACHE_TOOLS = frozenset({"navigate", "type", "select"})
+
+# Consecutive steps with an unchanged DOM before the LLM is bypassed once
+# in favour of scrolling to reveal new content
+STABLE_DOM_THRESHOLD = 2
+_STABLE_DOM_TOOL_CALL = {
+    "type": "function",
+    "function": {"name": "scroll", "arguments": json.dumps({"direction": "down"})}
+}
+
+@lru_cache(maxsize=1024)
+def _som_selector(element_id: int) -> str:
+    """CSS selector for a Set-of-Marks element ID (memoized)."""
+    return f"[data-som-id='{element_id}']"
+
+
+# Synthetic form-data generators by field type (built once)
+_SYNTHETIC_RNG = random.Random()
+
+# Numeric fields are drawn in batches: (low, high, format) per field type
+SYNTHETIC_BATCH_SIZE = 256
+_SYNTHETIC_NUMERIC_FIELDS = {
+    "phone": (1000000, 9999999, "+1555{}"),
+    "zip": (10000, 99999, "{}"),
+    "number": (1, 100, "{}"),
+}
+_synthetic_pools: dict[str, deque[str]] = defaultdict(deque)
+
+
+def _synthetic_numeric(field_type: str) -> str:
+    """
+    Next synthetic value for a numeric field, refilling its pool in one batch.
+    
+    Args:
+        field_type: Key of _SYNTHETIC_NUMERIC_FIELDS
+        
+    Returns:
+        Formatted value
+    """
+    pool = _synthetic_pools[field_type]
+    if not pool:
+        low, high, fmt = _SYNTHETIC_NUMERIC_FIELDS[field_type]
+        pool.extend(map(fmt.format, _SYNTHETIC_RNG.choices(
+            range(low, high + 1), k=SYNTHETIC_BATCH_SIZE
+        )))
+    return pool.popleft()
+
+_SYNTHETIC_GENERATORS = {
+    "email": lambda: f"test{_SYNTHETIC_RNG.randint(100, 999)}@example.com",
+    "password": lambda: "TestPass123!",
+    "phone": lambda: _synthetic_numeric("phone"),
+    "name": lambda: _SYNTHETIC_RNG.choice(["John Doe", "Jane Smith", "Bob Wilson"]),
+    "address": lambda: f"{_SYNTHETIC_RNG.randint(100, 999)} Main St",
+    "city": lambda: _SYNTHETIC_RNG.choice(["New York", "Los Angeles", "Chicago"]),
+    "zip": lambda: _synthetic_numeric("zip"),
+    "text": lambda: "".join(_SYNTHETIC_RNG.choices(string.ascii_letters, k=10)),
+    "number": lambda: _synthetic_numeric("number"),
+    "date": lambda: "2024-01-15",
+    "url": lambda: "https://example.com",
+}
+
+# Per-step user message. System prompt and tools form the stable prefix
+# that providers cache; everything volatile lives in this message.
+_NAVIGATOR_PROMPT = string.Template("""CURRENT STATE:
+- URL: $current_url
+- Loop Iteration: $loop_iteration
+
+ACCESSIBILITY TREE (elements with [ID] are interactive):
+$dom_snapshot
+
+RECENT ACTIONS:
+$actions
+
+EXPLORATION GAPS (areas needing more investigation):
+$gaps
+
+Based on the current page state, what is your next action?
+Choose the most valuable action to discover new API endpoints.
+Prioritize unexplored interactive elements, especially forms and buttons.""")
+
+
 class NavigatorAgent(BaseAgent):
     """
     Navigator Agent for UI exploration.
@@ -164,11 +258,48 @@ class NavigatorAgent(BaseAgent):
         """
         super().__init__(name="navigator", **kwargs)
         self.browser = browser_manager
+        
+        # Tool name -> handler taking parsed arguments
+        self._tool_handlers = {
+            "click": self._do_click,
+            "type": self._do_type,
+            "select": self._do_select,
+            "scroll": self._do_scroll,
+            "navigate": self._do_navigate,
+            "back": self._do_back,
+            "wait": self._do_wait,
+        }
+        
+        # Rendered prompt sections, reused while their inputs are unchanged:
+        # (scratchpad, revision, text) and (gaps shown, text)
+        self._actions_render: tuple[Any, int, str] | None = None
+        self._gaps_render: tuple[list[str], str] | None = None
+        
+        # (URL, DOM, memo, gaps) fingerprint -> tool call the LLM chose
+        self._response_cache: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+        # Key served from the cache last step; a repeat means the replay didn't advance
+        self._last_hit_key: bytes | None = None
+        
+        # Unchanged-DOM detection across steps
+        self._last_dom_digest: bytes | None = None
+        self._stable_dom_steps = 0
     
     def set_browser(self, browser_manager) -> None:
         """Set the browser manager."""
         self.browser = browser_manager
     
+    def set_scratchpad(self, scratchpad: NavigatorScratchpad) -> None:
+        """
+        Set the navigator's scratchpad.
+        The type is checked once here so per-step code can rely on it.
+        
+        Args:
+            scratchpad: Navigator scratchpad
+        """
+        if not isinstance(scratchpad, NavigatorScratchpad):
+            raise TypeError("NavigatorAgent requires a NavigatorScratchpad")
+        self.scratchpad = scratchpad
+    
     async def execute(self, state: AgentState) -> dict[str, Any]:
         """
         Execute navigation step.
@@ -184,43 +315,93 @@ class NavigatorAgent(BaseAgent):
         
         self.log(f"Exploring: {state.get('current_url', 'unknown')}")
         
-        # Build context for LLM
-        prompt = self._build_prompt(state)
-        
-        # Get LLM decision
         try:
-            response = await self.llm.invoke(
-                messages=prompt,
-                system_prompt=NAVIGATOR_SYSTEM_PROMPT,
-                tools=NAVIGATOR_TOOLS,
-                temperature=0.7
-            )
-            
-            # Parse and execute action
-            if response.tool_calls:
-                tool_call = response.tool_calls[0]
-                action_result = await self._execute_tool_call(tool_call)
+            # Both DOM heuristics need a real snapshot: without one the digest
+            # never changes and the cache key collapses to the URL
+            dom_snapshot = state.get('dom_snapshot')
+            cache_key = None
+            tool_call = None
+            if dom_snapshot:
+                dom_digest = self._dom_digest(dom_snapshot)
+                if dom_digest == self._last_dom_digest:
+                    self._stable_dom_steps += 1
+                else:
+                    self._last_dom_digest = dom_digest
+                    self._stable_dom_steps = 0
                 
-                # Update scratchpad
-                if self.scratchpad and isinstance(self.scratchpad, NavigatorScratchpad):
-                    self.scratchpad.add_action({
-                        "tool": tool_call["function"]["name"],
-                        "args": json.loads(tool_call["function"]["arguments"]),
-                        "result": action_result
-                    })
-                
-                return {
-                    "messages": [self.create_message(
-                        f"Executed: {tool_call['function']['name']} - {action_result}"
-                    )],
-                    "current_url": await self.browser.get_current_url(),
-                }
+                if self._stable_dom_steps >= STABLE_DOM_THRESHOLD:
+                    # Page is static; scroll instead of asking the LLM or
+                    # replaying a cached decision for the same page again
+                    self.log("DOM unchanged, scrolling without LLM")
+                    self._stable_dom_steps = 0
+                    tool_call = _STABLE_DOM_TOOL_CALL
+                else:
+                    # Same page, DOM and memo as a previous step: reuse its decision,
+                    # but never serve the same hit twice in a row (the replay left
+                    # the inputs unchanged)
+                    cache_key = self._response_key(state, dom_digest)
+                    if cache_key != self._last_hit_key:
+                        tool_call = self._cached_tool_call(cache_key)
             else:
-                # No tool call, LLM provided reasoning only
-                return {
-                    "messages": [self.create_message(response.content)]
-                }
+                self._last_dom_digest = None
+                self._stable_dom_steps = 0
+            cache_hit = tool_call is not None and tool_call is not _STABLE_DOM_TOOL_CALL
+            self._last_hit_key = cache_key if cache_hit else None
+            
+            if tool_call is None:
+                # Build context for LLM
+                prompt = self._build_prompt(state)
+                
+                # Get LLM decision
+                response = await self.llm.invoke(
+                    messages=prompt,
+                    system_prompt=NAVIGATOR_SYSTEM_PROMPT,
+                    tools=NAVIGATOR_TOOLS,
+                    temperature=0.7,
+                    cache_prefix=True
+                )
                 
+                if not response.tool_calls:
+                    # No tool call, LLM provided reasoning only
+                    return {
+                        "messages": [self.create_message(response.content)]
+                    }
+                tool_call = response.tool_calls[0]
+            
+            # Parse and execute action
+            function = tool_call["function"]
+            name = function["name"]
+            args = json.loads(function["arguments"])
+            action_result = await self._execute_tool_call(name, args)
+            
+            # Replaying a failed or unknown action would just fail again, and
+            # state-changing ones are unsafe to replay; only fresh LLM decisions
+            # are stored (the synthetic scroll never gets a cache key)
+            if cache_key is not None:
+                failed = (
+                    name not in self._tool_handlers
+                    or action_result.startswith(_TOOL_FAILURE_PREFIX)
+                )
+                if failed or name in _NO_CACHE_TOOLS:
+                    self._response_cache.pop(cache_key, None)
+                elif not cache_hit:
+                    self._store_tool_call(cache_key, tool_call)
+            
+            # Update scratchpad
+            if self.scratchpad is not None:
+                self.scratchpad.add_action({
+                    "tool": name,
+                    "args": args,
+                    "result": action_result
+                })
+            
+            return {
+                "messages": [self.create_message(
+                    f"Executed: {name} - {action_result}"
+                )],
+                "current_url": await self.browser.get_current_url(),
+            }
+        
         except Exception as e:
             self.log(f"Error: {str(e)}")
             return {
@@ -239,103 +420,129 @@ class NavigatorAgent(BaseAgent):
         Returns:
             Formatted prompt string
         """
-        # Get exploration context from scratchpad
-        visited_count = len(state.get("exploration_gaps", []))
-        recent_actions = []
-        if self.scratchpad:
-            recent_actions = self.scratchpad.recent_actions[-5:]
+        actions_str = self._render_recent_actions()
         
-        # Format recent actions
-        actions_str = ""
-        if recent_actions:
-            actions_str = "\n".join([
-                f"  - {a.get('tool', 'unknown')}: {a.get('result', 'no result')}"
-                for a in recent_actions
-            ])
+        # Get exploration gaps (re-rendered only when the shown gaps change)
+        gaps = state.get("exploration_gaps", [])[:5]
+        cached = self._gaps_render
+        if cached is not None and cached[0] == gaps:
+            gaps_str = cached[1]
         else:
-            actions_str = "  (none yet)"
+            gaps_str = "\n".join([f"  - {g}" for g in gaps]) if gaps else "  (none identified)"
+            self._gaps_render = (gaps, gaps_str)
         
-        # Get exploration gaps
-        gaps = state.get("exploration_gaps", [])
-        gaps_str = "\n".join([f"  - {g}" for g in gaps[:5]]) if gaps else "  (none identified)"
+        return _NAVIGATOR_PROMPT.substitute(
+            current_url=state.get('current_url', 'unknown'),
+            loop_iteration=state.get('loop_iteration', 0),
+            dom_snapshot=state.get('dom_snapshot', 'Unable to capture page structure'),
+            actions=actions_str,
+            gaps=gaps_str
+        )
+    
+    def _dom_digest(self, dom_snapshot: str) -> bytes:
+        """
+        Fingerprint a DOM snapshot.
         
-        prompt = f"""CURRENT STATE:
-- URL: {state.get('current_url', 'unknown')}
-- Loop Iteration: {state.get('loop_iteration', 0)}
-
-ACCESSIBILITY TREE (elements with [ID] are interactive):
-{state.get('dom_snapshot', 'Unable to capture page structure')}
-
-RECENT ACTIONS:
-{actions_str}
-
-EXPLORATION GAPS (areas needing more investigation):
-{gaps_str}
-
-Based on the current page state, what is your next action?
-Choose the most valuable action to discover new API endpoints.
-Prioritize unexplored interactive elements, especially forms and buttons."""
-
-        return prompt
+        Args:
+            dom_snapshot: Accessibility tree text
+            
+        Returns:
+            16-byte content digest (XXH3-128, BLAKE2b fallback)
+        """
+        return content_digest(dom_snapshot)
+    
+    def _response_key(self, state: AgentState, dom_digest: bytes) -> bytes:
+        """
+        Fingerprint the inputs that determine the navigator's decision.
+        
+        Args:
+            state: Current state
+            dom_digest: Fingerprint of the DOM snapshot
+            
+        Returns:
+            16-byte BLAKE2b digest of URL, DOM, memo and shown gaps
+        """
+        digest = hashlib.blake2b(dom_digest, digest_size=16)
+        for part in (
+            state.get('current_url', ''),
+            self._render_recent_actions(),
+            "\n".join(state.get("exploration_gaps", [])[:5]),
+        ):
+            digest.update(b"\0")
+            digest.update(part.encode("utf-8", "surrogatepass"))
+        return digest.digest()
     
-    async def _execute_tool_call(self, tool_call: dict[str, Any]) -> str:
+    def _cached_tool_call(self, key: bytes) -> dict[str, Any] | None:
+        """
+        Look up a previous decision for identical inputs.
+        
+        Args:
+            key: Decision fingerprint
+            
+        Returns:
+            Cached tool call, or None
+        """
+        tool_call = self._response_cache.get(key)
+        if tool_call is not None:
+            self._response_cache.move_to_end(key)
+            self.log("Reusing cached navigation decision")
+        return tool_call
+    
+    def _store_tool_call(self, key: bytes, tool_call: dict[str, Any]) -> None:
+        """
+        Cache a decision, evicting the least recently used.
+        
+        Args:
+            key: Decision fingerprint
+            tool_call: Tool call to replay on a hit
+        """
+        cache = self._response_cache
+        cache[key] = tool_call
+        cache.move_to_end(key)
+        while len(cache) > NAVIGATOR_RESPONSE_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def _render_recent_actions(self) -> str:
+        """
+        Format the exploration memo for the prompt.
+        Cached by scratchpad identity and revision.
+        
+        Returns:
+            Bullet list of recent actions
+        """
+        scratchpad = self.scratchpad
+        if not scratchpad:
+            return "  (none yet)"
+        
+        cached = self._actions_render
+        if cached is not None and cached[0] is scratchpad and cached[1] == scratchpad.revision:
+            return cached[2]
+        
+        # Bounded memo instead of raw (possibly huge) action results
+        actions_str = scratchpad.render_memo()
+        
+        self._actions_render = (scratchpad, scratchpad.revision, actions_str)
+        return actions_str
+    
+    async def _execute_tool_call(self, name: str, args: dict[str, Any]) -> str:
         """
         Execute a tool call from the LLM.
         
         Args:
-            tool_call: Tool call dictionary
+            name: Tool name
+            args: Parsed tool arguments
             
         Returns:
             Result description
         """
-        name = tool_call["function"]["name"]
-        args = json.loads(tool_call["function"]["arguments"])
+        handler = self._tool_handlers.get(name)
+        if handler is None:
+            return f"Unknown tool: {name}"
         
         try:
-            if name == "click":
-                element_id = args["element_id"]
-                await self.browser.click_element_by_id(element_id)
-                return f"Clicked element [{element_id}]"
-            
-            elif name == "type":
-                element_id = args["element_id"]
-                text = args["text"]
-                selector = f"[data-som-id='{element_id}']"
-                await self.browser.type_text(selector, text)
-                return f"Typed '{text[:20]}...' into element [{element_id}]"
-            
-            elif name == "select":
-                element_id = args["element_id"]
-                value = args["value"]
-                selector = f"[data-som-id='{element_id}']"
-                await self.browser.select_option(selector, value)
-                return f"Selected '{value}' in element [{element_id}]"
-            
-            elif name == "scroll":
-                direction = args["direction"]
-                await self.browser.scroll(direction)
-                return f"Scrolled {direction}"
-            
-            elif name == "navigate":
-                url = args["url"]
-                await self.browser.navigate(url)
-                return f"Navigated to {url}"
-            
-            elif name == "back":
-                await self.browser.go_back()
-                return "Went back to previous page"
-            
-            elif name == "wait":
-                # Just wait for network idle
-                if self.browser.page:
-                    await self.browser.page.wait_for_timeout(2000)
-                return f"Waited for content to load"
-            
-            else:
-                return f"Unknown tool: {name}"
-                
+            return await handler(args)
         except Exception as e:
-            error_msg = f"Failed to execute {name}: {str(e)}"
+            error_msg = f"{_TOOL_FAILURE_PREFIX} {name}: {str(e)}"
             
             # Track failure in scratchpad
             if self.scratchpad:
@@ -347,6 +554,52 @@ Prioritize unexplored interactive elements, especially forms and buttons."""
             
             return error_msg
     
+    async def _do_click(self, args: dict[str, Any]) -> str:
+        """Click an element by Set-of-Marks ID."""
+        element_id = args["element_id"]
+        await self.browser.click_element_by_id(element_id)
+        return f"Clicked element [{element_id}]"
+    
+    async def _do_type(self, args: dict[str, Any]) -> str:
+        """Type text into an input by Set-of-Marks ID."""
+        element_id = args["element_id"]
+        text = args["text"]
+        selector = _som_selector(element_id)
+        await self.browser.type_text(selector, text)
+        return f"Typed '{text[:20]}...' into element [{element_id}]"
+    
+    async def _do_select(self, args: dict[str, Any]) -> str:
+        """Select a dropdown option by Set-of-Marks ID."""
+        element_id = args["element_id"]
+        value = args["value"]
+        selector = _som_selector(element_id)
+        await self.browser.select_option(selector, value)
+        return f"Selected '{value}' in element [{element_id}]"
+    
+    async def _do_scroll(self, args: dict[str, Any]) -> str:
+        """Scroll the page."""
+        direction = args["direction"]
+        await self.browser.scroll(direction)
+        return f"Scrolled {direction}"
+    
+    async def _do_navigate(self, args: dict[str, Any]) -> str:
+        """Navigate directly to a URL."""
+        url = args["url"]
+        await self.browser.navigate(url)
+        return f"Navigated to {url}"
+    
+    async def _do_back(self, args: dict[str, Any]) -> str:
+        """Go back to the previous page."""
+        await self.browser.go_back()
+        return "Went back to previous page"
+    
+    async def _do_wait(self, args: dict[str, Any]) -> str:
+        """Wait for dynamic content to load."""
+        # Just wait for network idle
+        if self.browser.page:
+            await self.browser.page.wait_for_timeout(2000)
+        return "Waited for content to load"
+    
     async def get_available_actions(self, state: AgentState) -> list[dict[str, Any]]:
         """
         Get list of available actions on current page.
@@ -371,21 +624,7 @@ Prioritize unexplored interactive elements, especially forms and buttons."""
         Returns:
             Synthetic data string
         """
-        import random
-        import string
-        
-        generators = {
-            "email": lambda: f"test{random.randint(100,999)}@example.com",
-            "password": lambda: "TestPass123!",
-            "phone": lambda: f"+1555{random.randint(1000000, 9999999)}",
-            "name": lambda: random.choice(["John Doe", "Jane Smith", "Bob Wilson"]),
-            "address": lambda: f"{random.randint(100,999)} Main St",
-            "city": lambda: random.choice(["New York", "Los Angeles", "Chicago"]),
-            "zip": lambda: f"{random.randint(10000, 99999)}",
-            "text": lambda: "".join(random.choices(string.ascii_letters, k=10)),
-            "number": lambda: str(random.randint(1, 100)),
-            "date": lambda: "2024-01-15",
-            "url": lambda: "https://example.com",
-        }
-        
-        return generators.get(field_type, generators["text"])()
+        generator = _SYNTHETIC_GENERATORS.get(field_type)
+        if generator is None:
+            generator = _SYNTHETIC_GENERATORS["text"]
+        return generator()
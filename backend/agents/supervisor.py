@@ -3,12 +3,29 @@ Supervisor - LangGraph Orchestrator.
 Manages the Scientific Loop: Explore → Observe → Infer → Critique → Probe → Update → Repeat
 """
 
+import asyncio
 from typing import Literal, Any
-from datetime import datetime
 
+from .base import tick_timestamp
+from .navigator import NavigatorAgent
+from .interceptor import InterceptorAgent
+from .analyst import AnalystAgent
+from .business_logic import BusinessLogicAgent
+from .critic import CriticAgent
+from .verifier import VerifierAgent
 from ..core.state import AgentState, create_initial_state
 from ..core.config import settings
 
+try:
+    from langgraph.graph import StateGraph, START, END
+    LANGGRAPH_AVAILABLE = True
+except ImportError:
+    LANGGRAPH_AVAILABLE = False
+
+
+# Errors tolerated before the loop terminates
+MAX_ERROR_COUNT = 10
+
 
 def route_by_phase(state: AgentState) -> str:
     """
@@ -20,21 +37,13 @@ def route_by_phase(state: AgentState) -> str:
     Returns:
         Next node name
     """
-    # Check termination conditions first
+    # Termination limits are evaluated by the supervisor node, which
+    # clears should_continue when one fires
     if state.get("should_continue") == False:
         return "terminate"
     
-    # Check error threshold
-    if state.get("error_count", 0) > 10:
-        return "terminate"
-    
-    # Check iteration limit
-    if state.get("loop_iteration", 0) >= settings.max_loop_iterations:
-        return "terminate"
-    
     # Route by phase
-    phase = state.get("loop_phase", "explore")
-    return phase
+    return state.get("loop_phase", "explore")
 
 
 def critic_routing(state: AgentState) -> str:
@@ -47,27 +56,42 @@ def critic_routing(state: AgentState) -> str:
     Returns:
         Next node: "probe_needed", "more_exploration", or "accept"
     """
-    reviews = state.get("critic_reviews", [])
-    
-    # Check if any hypothesis needs probing
-    needs_probe = any(
-        r.get("required_probes")
-        for r in reviews
-    )
-    if needs_probe:
+    # Flags are computed by the critic when it writes its reviews
+    if state.get("probes_pending"):
         return "probe_needed"
     
-    # Check if more exploration is needed
-    needs_exploration = any(
-        r.get("required_exploration")
-        for r in reviews
-    )
-    if needs_exploration:
+    if state.get("exploration_pending"):
         return "more_exploration"
     
     return "accept"
 
 
+def termination_reason(iteration: int, error_count: int) -> str | None:
+    """
+    Evaluate the loop limits. Shared by the supervisor and the
+    memory-update node so thresholds and messages live in one place.
+    
+    Args:
+        iteration: Loop iteration to check
+        error_count: Errors so far
+        
+    Returns:
+        Termination reason or None to continue
+    """
+    # Check iteration limit
+    if iteration >= settings.max_loop_iterations:
+        return f"Maximum iterations ({settings.max_loop_iterations}) reached"
+    
+    # Check error limit
+    if error_count > MAX_ERROR_COUNT:
+        return f"Too many errors ({error_count})"
+    
+    # Check if all hypotheses are confident
+    # (In real implementation, would check hypothesis store)
+    
+    return None
+
+
 def check_termination(state: AgentState) -> str:
     """
     Check if exploration should terminate.
@@ -121,7 +145,6 @@ class Supervisor:
         # Determine next phase based on what we have
         new_observations = state.get("new_observations", [])
         pending_hypotheses = state.get("pending_hypotheses", [])
-        critic_reviews = state.get("critic_reviews", [])
         probe_results = state.get("probe_results", [])
         
         # State machine for scientific loop
@@ -147,8 +170,7 @@ class Supervisor:
         
         elif current_phase == "critique":
             # After critique, check if probing needed
-            needs_probe = any(r.get("required_probes") for r in critic_reviews)
-            if needs_probe:
+            if state.get("probes_pending"):
                 next_phase = "probe"
             else:
                 # No probing needed, update memory and continue
@@ -169,7 +191,7 @@ class Supervisor:
                         "role": "assistant",
                         "content": f"Terminating: {should_stop}",
                         "name": "supervisor",
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": tick_timestamp()
                     }]
                 }
             else:
@@ -180,16 +202,24 @@ class Supervisor:
             # Unknown phase, start exploring
             next_phase = "explore"
         
-        return {
+        updates = {
             "loop_phase": next_phase,
             "loop_iteration": iteration + 1,
             "messages": [{
                 "role": "assistant",
                 "content": f"Iteration {iteration + 1}: {current_phase} → {next_phase}",
                 "name": "supervisor",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": tick_timestamp()
             }]
         }
+        
+        # Decide termination here so routing is a single flag check
+        should_stop = termination_reason(iteration + 1, state.get("error_count", 0))
+        if should_stop:
+            updates["should_continue"] = False
+            updates["termination_reason"] = should_stop
+        
+        return updates
     
     def _check_termination(self, state: AgentState) -> str | None:
         """
@@ -201,21 +231,10 @@ class Supervisor:
         Returns:
             Termination reason or None to continue
         """
-        iteration = state.get("loop_iteration", 0)
-        error_count = state.get("error_count", 0)
-        
-        # Check iteration limit
-        if iteration >= settings.max_loop_iterations:
-            return f"Maximum iterations ({settings.max_loop_iterations}) reached"
-        
-        # Check error limit
-        if error_count > 10:
-            return f"Too many errors ({error_count})"
-        
-        # Check if all hypotheses are confident
-        # (In real implementation, would check hypothesis store)
-        
-        return None
+        return termination_reason(
+            state.get("loop_iteration", 0),
+            state.get("error_count", 0)
+        )
 
 
 def build_scientific_loop_graph():
@@ -225,18 +244,9 @@ def build_scientific_loop_graph():
     Returns:
         Compiled LangGraph workflow
     """
-    try:
-        from langgraph.graph import StateGraph, START, END
-    except ImportError:
+    if not LANGGRAPH_AVAILABLE:
         raise ImportError("langgraph package not installed. Run: pip install langgraph")
     
-    from .navigator import NavigatorAgent
-    from .interceptor import InterceptorAgent
-    from .analyst import AnalystAgent
-    from .business_logic import BusinessLogicAgent
-    from .critic import CriticAgent
-    from .verifier import VerifierAgent
-    
     # Create workflow
     workflow = StateGraph(AgentState)
     
@@ -257,7 +267,6 @@ def build_scientific_loop_graph():
     workflow.add_node("critique", critic.execute)
     workflow.add_node("probe", verifier.execute)
     workflow.add_node("update", _memory_update_node)
-    workflow.add_node("termination_check", _termination_check_node)
     
     # Define edges
     workflow.add_edge(START, "supervisor")
@@ -283,11 +292,10 @@ def build_scientific_loop_graph():
     workflow.add_edge("infer", "supervisor")
     workflow.add_edge("critique", "supervisor")
     workflow.add_edge("probe", "supervisor")
-    workflow.add_edge("update", "termination_check")
     
-    # Termination check
+    # Update decides termination inline and routes straight on
     workflow.add_conditional_edges(
-        "termination_check",
+        "update",
         check_termination,
         {
             "continue": "supervisor",
@@ -310,18 +318,26 @@ def _infer_node(analyst, business_logic):
         Node function
     """
     async def infer(state: AgentState) -> dict[str, Any]:
-        # Run analyst first
-        analyst_result = await analyst.execute(state)
-        
-        # Update state with analyst results
-        updated_state = {**state, **analyst_result}
+        # Business logic reads observations, not analyst output, so both
+        # agents run concurrently against the same state
+        analyst_result, bl_result = await asyncio.gather(
+            analyst.execute(state),
+            business_logic.execute(state)
+        )
         
-        # Run business logic
-        bl_result = await business_logic.execute(updated_state)
+        # Merge: analyst hypotheses first, then business-logic ones that are
+        # new (it echoes back hypotheses already pending in state)
+        hypotheses = list(analyst_result.get("pending_hypotheses", []))
+        seen = {h.get("id") for h in state.get("pending_hypotheses", [])}
+        seen.update(h.get("id") for h in hypotheses)
+        hypotheses.extend(
+            h for h in bl_result.get("pending_hypotheses", [])
+            if h.get("id") not in seen
+        )
         
         # Merge results
         return {
-            "pending_hypotheses": bl_result.get("pending_hypotheses", []),
+            "pending_hypotheses": hypotheses,
             "messages": analyst_result.get("messages", []) + bl_result.get("messages", [])
         }
     
@@ -338,51 +354,32 @@ async def _memory_update_node(state: AgentState) -> dict[str, Any]:
     Returns:
         State updates
     """
+    # Check termination conditions
+    reason = termination_reason(
+        state.get("loop_iteration", 0),
+        state.get("error_count", 0)
+    )
+    
     # Clear per-iteration state
-    return {
+    updates = {
         "new_observations": [],
         "pending_hypotheses": [],
         "critic_reviews": [],
+        "probes_pending": False,
+        "exploration_pending": False,
         "probe_results": [],
         "messages": [{
             "role": "assistant",
             "content": "Memory updated, iteration complete",
             "name": "memory_update",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": tick_timestamp()
         }]
     }
-
-
-async def _termination_check_node(state: AgentState) -> dict[str, Any]:
-    """
-    Check termination conditions.
-    
-    Args:
-        state: Current state
-        
-    Returns:
-        State updates
-    """
-    iteration = state.get("loop_iteration", 0)
-    error_count = state.get("error_count", 0)
     
-    should_stop = False
-    reason = None
+    if reason:
+        updates["should_continue"] = False
+        updates["termination_reason"] = reason
+    else:
+        updates["should_continue"] = True
     
-    if iteration >= settings.max_loop_iterations:
-        should_stop = True
-        reason = "Maximum iterations reached"
-    
-    if error_count > 10:
-        should_stop = True
-        reason = "Too many errors"
-    
-    if should_stop:
-        return {
-            "should_continue": False,
-            "termination_reason": reason
-        }
-    
-    return {
-        "should_continue": True
-    }
+    return updates
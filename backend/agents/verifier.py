@@ -4,15 +4,209 @@ Confirms or falsifies hypotheses through controlled experiments.
 NOT for security exploitation - purely for validation.
 """
 
+import asyncio
 import json
+import re
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any
+from urllib.parse import urlparse
 from uuid import uuid4
 
 import httpx
 
 from .base import BaseAgent
+from ..core.config import settings
+from ..core.guardrails import TokenBucket
 from ..core.state import AgentState
 from ..core.models import ProbeType, ProbeOutcome, ProbeResult
+from ..utils.json_codec import json_dumps, json_loads
+
+try:
+    import h2  # noqa: F401 - httpx's HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Path parameter placeholders: {id} gets a numeric test value, anything else a string
+_PATH_ID_RE = re.compile(r'\{id\}')
+_PATH_ANY_RE = re.compile(r'\{[^}]+\}')
+
+# Probe-building memo sizes (many probes share one hypothesis)
+PROBE_BUILD_CACHE_SIZE = 512
+
+# JSON schema type -> (test value, field-type tag); "string" is handled by name
+_SCHEMA_TEST_VALUES = {
+    "integer": (1, "int"),
+    "number": (1.0, "float"),
+    "boolean": (True, "bool"),
+    "array": ([], "arr"),
+    "object": ({}, "obj"),
+}
+_MUTABLE_FIELD_TYPES = frozenset({"arr", "obj"})
+
+# Mutation targets; bool counts as int, as isinstance(True, int) always has here
+_INT_FIELD_TYPES = frozenset({"int", "bool"})
+_BOUNDARY_INT = 2147483647  # Max int
+_BOUNDARY_STRING = "x" * 10000  # Very long string
+_CHANGED_TYPE_INT = 12345
+
+
+@lru_cache(maxsize=PROBE_BUILD_CACHE_SIZE)
+def _filled_path(endpoint: str) -> str:
+    """
+    Fill path parameters with test values, memoized.
+    
+    Args:
+        endpoint: Endpoint pattern like /users/{id}
+        
+    Returns:
+        Filled path
+    """
+    return _PATH_ANY_RE.sub('test', _PATH_ID_RE.sub('1', endpoint))
+
+
+@lru_cache(maxsize=PROBE_BUILD_CACHE_SIZE)
+def _test_body_template(schema_key: str) -> tuple[dict[str, Any], dict[str, str]]:
+    """
+    Build the test body for a schema, memoized. Callers must copy the
+    body before mutating it.
+    
+    Args:
+        schema_key: Key-sorted JSON of the request schema (the cache key)
+        
+    Returns:
+        Tuple of (shared test body template, field -> field-type tag)
+    """
+    schema = json_loads(schema_key)
+    body = {}
+    field_types = {}
+    
+    properties = schema.get("properties", {})
+    
+    for field, field_schema in properties.items():
+        field_type = field_schema.get("type", "string")
+        
+        if field_type == "string":
+            if "email" in field.lower():
+                body[field] = "test@example.com"
+            elif "date" in field.lower():
+                body[field] = "2024-01-15"
+            else:
+                body[field] = f"test_{field}"
+            field_types[field] = "str"
+        elif field_type in _SCHEMA_TEST_VALUES:
+            body[field], field_types[field] = _SCHEMA_TEST_VALUES[field_type]
+    
+    return body, field_types
+
+# Probe outcome evaluation: (probe type, status bucket) -> (outcome, confidence delta, notes)
+_CONFIRMED = ProbeOutcome.CONFIRMED.value
+_FALSIFIED = ProbeOutcome.FALSIFIED.value
+_INCONCLUSIVE = ProbeOutcome.INCONCLUSIVE.value
+_ERROR_BUCKETS = ("400", "401", "403", "error")
+
+_DEFAULT_OUTCOME = (_INCONCLUSIVE, 0.0, "")
+_OUTCOME_TABLE: dict[tuple[str, str], tuple[str, float, str]] = {
+    # Replay should succeed
+    (ProbeType.REPLAY_EXACT.value, "2xx"): (_CONFIRMED, 0.15, "Replay successful - endpoint consistent"),
+    **{
+        (ProbeType.REPLAY_EXACT.value, bucket): (
+            _INCONCLUSIVE, -0.05, "Replay returned {status} - may be state-dependent"
+        )
+        for bucket in _ERROR_BUCKETS
+    },
+    # Should get 401 if auth required
+    (ProbeType.AUTH_VARIATION.value, "401"): (_CONFIRMED, 0.1, "Confirmed: endpoint requires authentication"),
+    (ProbeType.AUTH_VARIATION.value, "403"): (_CONFIRMED, 0.1, "Confirmed: endpoint requires authorization"),
+    (ProbeType.AUTH_VARIATION.value, "2xx"): (_CONFIRMED, 0.1, "Confirmed: endpoint allows unauthenticated access"),
+    (ProbeType.OMIT_FIELD.value, "400"): (_CONFIRMED, 0.1, "Confirmed: field is required"),
+    (ProbeType.OMIT_FIELD.value, "2xx"): (_CONFIRMED, 0.1, "Confirmed: field is optional"),
+    **{
+        (ProbeType.SEQUENCE_BREAK.value, bucket): (_CONFIRMED, 0.15, "Confirmed: sequence is enforced")
+        for bucket in _ERROR_BUCKETS
+    },
+    (ProbeType.SEQUENCE_BREAK.value, "2xx"): (_FALSIFIED, -0.3, "Falsified: sequence not enforced"),
+    (ProbeType.BOUNDARY_VALUE.value, "400"): (_CONFIRMED, 0.1, "Confirmed: validation rejects boundary values"),
+    (ProbeType.BOUNDARY_VALUE.value, "2xx"): (
+        _INCONCLUSIVE, 0.0, "Boundary values accepted - may need further testing"
+    ),
+}
+
+
+def _status_bucket(status: int) -> str:
+    """
+    Bucket an HTTP status for outcome lookup.
+    
+    Args:
+        status: HTTP status code
+        
+    Returns:
+        "400"/"401"/"403" for those codes, "2xx", "error" (other >= 400) or "other"
+    """
+    if 200 <= status < 300:
+        return "2xx"
+    if status in (400, 401, 403):
+        return str(status)
+    return "error" if status >= 400 else "other"
+
+# Connection pool shared by every probe; keepalive saves a TCP/TLS handshake per
+# request, and HTTP/2 (when h2 is installed) multiplexes concurrent probes to one host
+PROBE_TIMEOUT = 30.0
+PROBE_POOL_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# Only this much of a probe response is kept, so only this much is read
+RESPONSE_PREVIEW_BYTES = 500
+
+# Probe types whose evaluation looks past the status code; the rest skip the body
+# (status-only GETs are sent as HEAD, falling back to GET if HEAD is unsupported)
+_PROBE_NEEDS_BODY = frozenset({ProbeType.REPLAY_EXACT.value})
+_HEAD_UNSUPPORTED_STATUSES = frozenset({405, 501})
+
+# HEAD may be routed or authorized differently from GET, so a verdict drawn
+# from a HEAD status counts as weaker evidence
+HEAD_EVIDENCE_WEIGHT = 0.5
+
+_probe_client: httpx.AsyncClient | None = None
+_probe_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_probe_client() -> httpx.AsyncClient:
+    """
+    Get the shared probe HTTP client, creating it on first use.
+    
+    The pool is bound to the event loop that created it, so the client
+    is rebuilt when called from a different running loop. HTTP/2 is
+    negotiated when available; servers without it fall back to HTTP/1.1
+    over the same pool. The client's cookie jar rejects Set-Cookie so
+    the pool shared across agents never mixes sessions; each agent keeps
+    its own cookies and sends them explicitly per request.
+    
+    Returns:
+        Pooled AsyncClient
+    """
+    global _probe_client, _probe_client_loop
+    loop = asyncio.get_running_loop()
+    if _probe_client is None or _probe_client.is_closed or _probe_client_loop is not loop:
+        # A client left over from another loop can't be closed from this one; drop it
+        _probe_client_loop = loop
+        _probe_client = httpx.AsyncClient(
+            timeout=PROBE_TIMEOUT,
+            limits=PROBE_POOL_LIMITS,
+            http2=HTTP2_AVAILABLE,
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+    return _probe_client
+
+
+async def close_probe_client() -> None:
+    """Close the shared probe HTTP client, if one was created."""
+    global _probe_client, _probe_client_loop
+    if _probe_client is not None:
+        await _probe_client.aclose()
+        _probe_client = None
+        _probe_client_loop = None
 
 
 class VerifierAgent(BaseAgent):
@@ -34,9 +228,18 @@ class VerifierAgent(BaseAgent):
         self.auth_headers: dict[str, str] = {}
         self.cookies: dict[str, str] = {}
         
-        # Rate limiting
-        self.requests_made: int = 0
+        # Rate limiting: bursts up to max_requests_per_run, then paced to the target's limit
+        self.requests_made: int = 0  # Probe requests paced through the bucket
         self.max_requests_per_run: int = 10
+        self.max_concurrent_probes: int = 5
+        self._probe_semaphore = asyncio.Semaphore(self.max_concurrent_probes)
+        self._probe_bucket = TokenBucket(
+            capacity=self.max_requests_per_run,
+            refill_rate=settings.max_requests_per_minute / 60.0
+        )
+        
+        # (current_url, base_url) of the last probe; the page rarely changes within a batch
+        self._base_url_cache: tuple[str, str] | None = None
     
     async def execute(self, state: AgentState) -> dict[str, Any]:
         """
@@ -66,15 +269,27 @@ class VerifierAgent(BaseAgent):
         
         self.log(f"Executing {len(probes)} probes")
         
-        # Execute probes (limited)
-        results = []
-        for probe in probes[:self.max_requests_per_run]:
-            try:
-                result = await self._execute_probe(probe, state)
-                results.append(result)
-            except Exception as e:
-                self.log(f"Probe failed: {e}")
-                results.append(self._create_error_result(probe, str(e)))
+        # Index hypotheses once so each probe's lookup is O(1)
+        # In real implementation, would look up from hypothesis store
+        hypotheses_by_id = {
+            h.get("id"): h for h in state.get("pending_hypotheses", [])
+        }
+        
+        # Build the shared part of each hypothesis' request once, then derive
+        # every probe's request from it with a cheap mutation
+        base_requests = {
+            hypothesis_id: self._build_base_request(hypotheses_by_id.get(hypothesis_id), state)
+            for hypothesis_id in dict.fromkeys(p.get("hypothesis_id") for p in probes)
+        }
+        requests = []
+        for probe in probes:
+            base = base_requests[probe.get("hypothesis_id")]
+            requests.append(
+                self._apply_probe_mutation(base, probe.get("probe_type", "")) if base else None
+            )
+        
+        # Execute probes concurrently; the token bucket paces rather than drops them
+        results = await self._run_probes(probes, requests)
         
         # Summarize outcomes
         outcomes = [r.get("outcome", "unknown") for r in results]
@@ -93,17 +308,54 @@ class VerifierAgent(BaseAgent):
             )]
         }
     
+    async def _run_probes(
+        self,
+        probes: list[dict[str, Any]],
+        requests: list[dict[str, Any] | None]
+    ) -> list[dict[str, Any]]:
+        """
+        Execute probes concurrently, bounded by the probe semaphore
+        and paced by the probe token bucket.
+        
+        Args:
+            probes: Probe definitions
+            requests: Built request per probe (None if it could not be built)
+            
+        Returns:
+            Probe results in probe order
+        """
+        async def run(probe, request):
+            async with self._probe_semaphore:
+                return await self._execute_probe(probe, request)
+        
+        results = await asyncio.gather(
+            *(run(p, r) for p, r in zip(probes, requests)),
+            return_exceptions=True
+        )
+        
+        probe_results = []
+        for probe, result in zip(probes, results):
+            if isinstance(result, Exception):
+                self.log(f"Probe failed: {result}")
+                probe_results.append(self._create_error_result(probe, str(result)))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                probe_results.append(result)
+        
+        return probe_results
+    
     async def _execute_probe(
         self,
         probe: dict[str, Any],
-        state: AgentState
+        request: dict[str, Any] | None
     ) -> dict[str, Any]:
         """
         Execute a single probe.
         
         Args:
             probe: Probe definition
-            state: Current state
+            request: Request built for the probe, or None
             
         Returns:
             Probe result dictionary
@@ -113,72 +365,131 @@ class VerifierAgent(BaseAgent):
         
         self.log(f"Executing {probe_type} probe for {hypothesis_id}")
         
-        # Build request based on probe type
-        request = await self._build_probe_request(probe, state)
-        
         if not request:
             return self._create_error_result(probe, "Could not build request")
         
-        # Execute request
+        # Execute request over the shared connection pool
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.request(
-                    method=request.get("method", "GET"),
-                    url=request.get("url", ""),
-                    headers=request.get("headers", {}),
-                    json=request.get("body") if request.get("body") else None,
-                    cookies=self.cookies
-                )
-                
-                # Evaluate outcome
-                outcome = self._evaluate_outcome(probe, response)
-                
-                return {
-                    "id": str(uuid4()),
-                    "probe_id": probe.get("id", str(uuid4())),
-                    "hypothesis_id": hypothesis_id,
-                    "probe_type": probe_type,
-                    "request": {
-                        "method": request.get("method"),
-                        "url": request.get("url"),
-                        "headers": {k: v[:50] for k, v in request.get("headers", {}).items()}
-                    },
-                    "response_status": response.status_code,
-                    "response_body": response.text[:500] if response.text else None,
-                    "outcome": outcome["outcome"],
-                    "confidence_delta": outcome["confidence_delta"],
-                    "notes": outcome["notes"]
-                }
-                
+            method = request.get("method", "GET")
+            read_body = probe_type in _PROBE_NEEDS_BODY
+            send_method = "HEAD" if method == "GET" and not read_body else method
+            
+            response, preview = await self._send_probe(send_method, request, read_body)
+            if send_method == "HEAD" and response.status_code in _HEAD_UNSUPPORTED_STATUSES:
+                response, preview = await self._send_probe(method, request, read_body)
+            
+            # Evaluate outcome
+            outcome = self._evaluate_outcome(
+                probe, response, via_head=response.request.method == "HEAD"
+            )
+            
+            return {
+                "id": str(uuid4()),
+                "probe_id": probe.get("id", str(uuid4())),
+                "hypothesis_id": hypothesis_id,
+                "probe_type": probe_type,
+                "request": {
+                    "method": response.request.method,  # HEAD when sent as such
+                    "url": request.get("url"),
+                    "headers": {k: v[:50] for k, v in request.get("headers", {}).items()}
+                },
+                "response_status": response.status_code,
+                "response_body": preview.decode("utf-8", errors="replace") or None,
+                "outcome": outcome["outcome"],
+                "confidence_delta": outcome["confidence_delta"],
+                "notes": outcome["notes"]
+            }
+            
         except httpx.RequestError as e:
             return self._create_error_result(probe, f"Request failed: {str(e)}")
     
-    async def _build_probe_request(
+    async def _send_probe(
         self,
-        probe: dict[str, Any],
-        state: AgentState
-    ) -> dict[str, Any] | None:
+        method: str,
+        request: dict[str, Any],
+        read_body: bool
+    ) -> tuple[httpx.Response, bytes]:
         """
-        Build HTTP request for probe.
+        Send a probe request over the shared client.
+        
+        Every request takes a token from the probe bucket first (HEAD
+        fallbacks included), so all traffic to the target is paced;
+        unbuildable probes never get here and spend none. The response
+        is streamed and closed after at most the preview (or right after
+        the headers when the body is not needed).
+        
+        Requests that carry the session get the agent's current cookies,
+        and cookies the server sets on them are kept for later probes, so
+        refreshed session cookies are honoured. Auth-stripped probes
+        neither send nor update the session.
         
         Args:
-            probe: Probe definition
-            state: Current state
+            method: HTTP method to send
+            request: Built probe request
+            read_body: Whether to read the body preview
             
         Returns:
-            Request dictionary or None
+            Tuple of (closed response, body preview bytes)
         """
-        probe_type = probe.get("probe_type", "")
+        await self._probe_bucket.acquire()
+        self.requests_made += 1
+        
+        headers = request.get("headers", {})
+        with_session = request.get("with_session", True)
+        if with_session and self.cookies:
+            # Cookies may have been refreshed since the request was built
+            headers = {**headers, "Cookie": self._cookie_header()}
+        
+        # Bodies are encoded with orjson; headers already declare application/json
+        body = request.get("body")
+        client = get_probe_client()
+        async with client.stream(
+            method=method,
+            url=request.get("url", ""),
+            headers=headers,
+            content=json_dumps(body) if body else None
+        ) as response:
+            preview = await self._read_preview(response) if read_body else b""
+        
+        if with_session:
+            for cookie in response.cookies.jar:
+                self.cookies[cookie.name] = cookie.value or ""
+        return response, preview
+    
+    async def _read_preview(self, response: httpx.Response) -> bytes:
+        """
+        Read at most RESPONSE_PREVIEW_BYTES of a streamed response body.
         
-        # Get hypothesis to probe
-        # In real implementation, would look up from hypothesis store
-        hypotheses = state.get("pending_hypotheses", [])
-        hypothesis = None
-        for h in hypotheses:
-            if h.get("id") == probe.get("hypothesis_id"):
-                hypothesis = h
+        Args:
+            response: Open streaming response
+            
+        Returns:
+            Body prefix
+        """
+        chunks = []
+        total = 0
+        async for chunk in response.aiter_bytes(chunk_size=RESPONSE_PREVIEW_BYTES):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= RESPONSE_PREVIEW_BYTES:
                 break
+        return b"".join(chunks)[:RESPONSE_PREVIEW_BYTES]
+    
+    def _build_base_request(
+        self,
+        hypothesis: dict[str, Any] | None,
+        state: AgentState
+    ) -> dict[str, Any] | None:
+        """
+        Build the request shared by all probes of a hypothesis.
         
+        Args:
+            hypothesis: Hypothesis to probe
+            state: Current state
+            
+        Returns:
+            Base request dictionary (with the body's field types) or None
+        """
         if not hypothesis:
             return None
         
@@ -188,66 +499,96 @@ class VerifierAgent(BaseAgent):
         
         # Get base URL from current URL
         current_url = state.get("current_url", "")
-        if current_url:
-            from urllib.parse import urlparse
+        if not current_url:
+            return None
+        if self._base_url_cache and self._base_url_cache[0] == current_url:
+            base_url = self._base_url_cache[1]
+        else:
             parsed = urlparse(current_url)
             base_url = f"{parsed.scheme}://{parsed.netloc}"
-        else:
-            return None
+            self._base_url_cache = (current_url, base_url)
         
         # Replace path parameters with test values
         url = base_url + self._fill_path_params(endpoint)
         
-        # Build headers
+        # Build headers (cookies travel as a header so auth stripping covers them)
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
             **self.auth_headers
         }
+        if self.cookies:
+            headers["Cookie"] = self._cookie_header()
         
         # Build body for write methods
         body = None
+        field_types: dict[str, str] = {}
         if method in ("POST", "PUT", "PATCH"):
-            body = self._generate_test_body(hypothesis.get("request_schema", {}))
-        
-        # Apply probe-specific modifications
-        if probe_type == ProbeType.AUTH_VARIATION.value:
-            # Remove auth
-            headers = {k: v for k, v in headers.items() 
-                      if k.lower() not in ("authorization", "cookie")}
-        
-        elif probe_type == ProbeType.OMIT_FIELD.value:
-            # Remove a field from body
-            if body and isinstance(body, dict):
-                keys = list(body.keys())
-                if keys:
-                    del body[keys[0]]
-        
-        elif probe_type == ProbeType.BOUNDARY_VALUE.value:
-            # Use boundary values
-            if body and isinstance(body, dict):
-                for key in body:
-                    if isinstance(body[key], int):
-                        body[key] = 2147483647  # Max int
-                    elif isinstance(body[key], str):
-                        body[key] = "x" * 10000  # Very long string
-        
-        elif probe_type == ProbeType.CHANGE_TYPE.value:
-            # Change field types
-            if body and isinstance(body, dict):
-                for key in body:
-                    if isinstance(body[key], int):
-                        body[key] = str(body[key])
-                    elif isinstance(body[key], str):
-                        body[key] = 12345
+            body, field_types = self._generate_test_body(hypothesis.get("request_schema", {}))
         
         return {
             "method": method,
             "url": url,
             "headers": headers,
-            "body": body
+            "body": body,
+            "field_types": field_types,
+            "with_session": True
         }
     
+    def _apply_probe_mutation(
+        self,
+        base: dict[str, Any],
+        probe_type: str
+    ) -> dict[str, Any]:
+        """
+        Derive a probe's request from its hypothesis' base request.
+        The base is shared, so mutations return shallow copies.
+        
+        Args:
+            base: Base request from _build_base_request
+            probe_type: Probe type value
+            
+        Returns:
+            Request dictionary for the probe
+        """
+        body = base["body"]
+        field_types = base["field_types"]
+        
+        if probe_type == ProbeType.AUTH_VARIATION.value:
+            # Remove auth
+            return {**base, "with_session": False, "headers": {
+                k: v for k, v in base["headers"].items()
+                if k.lower() not in ("authorization", "cookie")
+            }}
+        
+        if not body:
+            return base
+        
+        if probe_type == ProbeType.OMIT_FIELD.value:
+            # Remove a field from body
+            omitted = next(iter(body))
+            return {**base, "body": {k: v for k, v in body.items() if k != omitted}}
+        
+        if probe_type == ProbeType.BOUNDARY_VALUE.value:
+            # Use boundary values (field types are known from generation)
+            return {**base, "body": {
+                k: _BOUNDARY_INT if t in _INT_FIELD_TYPES
+                else _BOUNDARY_STRING if t == "str"
+                else body[k]
+                for k, t in field_types.items()
+            }}
+        
+        if probe_type == ProbeType.CHANGE_TYPE.value:
+            # Change field types
+            return {**base, "body": {
+                k: str(body[k]) if t in _INT_FIELD_TYPES
+                else _CHANGED_TYPE_INT if t == "str"
+                else body[k]
+                for k, t in field_types.items()
+            }}
+        
+        return base
+    
     def _fill_path_params(self, endpoint: str) -> str:
         """
         Fill path parameters with test values.
@@ -258,15 +599,12 @@ class VerifierAgent(BaseAgent):
         Returns:
             Filled path
         """
-        import re
-        
-        # Replace {id} with test value
-        filled = re.sub(r'\{id\}', '1', endpoint)
-        filled = re.sub(r'\{[^}]+\}', 'test', filled)
-        
-        return filled
+        return _filled_path(endpoint)
     
-    def _generate_test_body(self, schema: dict[str, Any]) -> dict[str, Any]:
+    def _generate_test_body(
+        self,
+        schema: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, str]]:
         """
         Generate test request body from schema.
         
@@ -274,40 +612,22 @@ class VerifierAgent(BaseAgent):
             schema: JSON schema
             
         Returns:
-            Test body dictionary
+            Tuple of (fresh test body, field -> field-type tag). The
+            body is a copy since probes mutate it; field types are shared.
         """
-        body = {}
-        
-        properties = schema.get("properties", {})
-        required = schema.get("required", [])
-        
-        for field, field_schema in properties.items():
-            field_type = field_schema.get("type", "string")
-            
-            if field_type == "string":
-                if "email" in field.lower():
-                    body[field] = "test@example.com"
-                elif "date" in field.lower():
-                    body[field] = "2024-01-15"
-                else:
-                    body[field] = f"test_{field}"
-            elif field_type == "integer":
-                body[field] = 1
-            elif field_type == "number":
-                body[field] = 1.0
-            elif field_type == "boolean":
-                body[field] = True
-            elif field_type == "array":
-                body[field] = []
-            elif field_type == "object":
-                body[field] = {}
-        
-        return body
+        template, field_types = _test_body_template(json_dumps(schema, sort_keys=True))
+        # Only the empty array/object values are mutable; copy those too
+        body = {
+            k: template[k].copy() if t in _MUTABLE_FIELD_TYPES else template[k]
+            for k, t in field_types.items()
+        }
+        return body, field_types
     
     def _evaluate_outcome(
         self,
         probe: dict[str, Any],
-        response: httpx.Response
+        response: httpx.Response,
+        via_head: bool = False
     ) -> dict[str, Any]:
         """
         Evaluate probe outcome based on response.
@@ -315,74 +635,21 @@ class VerifierAgent(BaseAgent):
         Args:
             probe: Probe definition
             response: HTTP response
+            via_head: Status came from a HEAD standing in for a GET
             
         Returns:
             Outcome evaluation
         """
-        probe_type = probe.get("probe_type", "")
-        expected = probe.get("expected_outcome", "")
         status = response.status_code
+        outcome, confidence_delta, notes = _OUTCOME_TABLE.get(
+            (probe.get("probe_type", ""), _status_bucket(status)),
+            _DEFAULT_OUTCOME
+        )
+        notes = notes.format(status=status)
         
-        # Default evaluation
-        outcome = ProbeOutcome.INCONCLUSIVE.value
-        confidence_delta = 0.0
-        notes = ""
-        
-        if probe_type == ProbeType.REPLAY_EXACT.value:
-            # Replay should succeed
-            if 200 <= status < 300:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.15
-                notes = "Replay successful - endpoint consistent"
-            elif status >= 400:
-                outcome = ProbeOutcome.INCONCLUSIVE.value
-                confidence_delta = -0.05
-                notes = f"Replay returned {status} - may be state-dependent"
-        
-        elif probe_type == ProbeType.AUTH_VARIATION.value:
-            # Should get 401 if auth required
-            if status == 401:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.1
-                notes = "Confirmed: endpoint requires authentication"
-            elif status == 403:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.1
-                notes = "Confirmed: endpoint requires authorization"
-            elif 200 <= status < 300:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.1
-                notes = "Confirmed: endpoint allows unauthenticated access"
-        
-        elif probe_type == ProbeType.OMIT_FIELD.value:
-            if status == 400:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.1
-                notes = "Confirmed: field is required"
-            elif 200 <= status < 300:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.1
-                notes = "Confirmed: field is optional"
-        
-        elif probe_type == ProbeType.SEQUENCE_BREAK.value:
-            if status >= 400:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.15
-                notes = "Confirmed: sequence is enforced"
-            elif 200 <= status < 300:
-                outcome = ProbeOutcome.FALSIFIED.value
-                confidence_delta = -0.3
-                notes = "Falsified: sequence not enforced"
-        
-        elif probe_type == ProbeType.BOUNDARY_VALUE.value:
-            if status == 400:
-                outcome = ProbeOutcome.CONFIRMED.value
-                confidence_delta = 0.1
-                notes = "Confirmed: validation rejects boundary values"
-            elif 200 <= status < 300:
-                outcome = ProbeOutcome.INCONCLUSIVE.value
-                confidence_delta = 0.0
-                notes = "Boundary values accepted - may need further testing"
+        if via_head and notes:
+            confidence_delta *= HEAD_EVIDENCE_WEIGHT
+            notes += " (status from HEAD; weaker evidence)"
         
         return {
             "outcome": outcome,
@@ -435,6 +702,15 @@ class VerifierAgent(BaseAgent):
         if cookies:
             self.cookies.update(cookies)
     
+    def _cookie_header(self) -> str:
+        """
+        Render the agent's cookies as a Cookie header value.
+        
+        Returns:
+            Cookie header value
+        """
+        return "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+    
     def clear_auth(self) -> None:
         """Clear authentication state."""
         self.auth_headers = {}
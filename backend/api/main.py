@@ -8,6 +8,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from ..core.config import settings
+from ..agents.verifier import close_probe_client
 from ..memory.fsm_store import FSMStore
 from ..memory.chroma_store import ChromaStore
 from ..memory.global_memory import GlobalMemoryManager
@@ -60,6 +61,7 @@ async def lifespan(app: FastAPI):
         await fsm_store.close()
     if chroma_store:
         await chroma_store.close()
+    await close_probe_client()
 
 
 def create_app() -> FastAPI:
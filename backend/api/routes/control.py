@@ -6,8 +6,8 @@ from typing import Any
 import asyncio
 import json
 import time
-import hashlib
 from datetime import datetime
+from functools import lru_cache
 
 from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
 from pydantic import BaseModel
@@ -15,6 +15,7 @@ from pydantic import BaseModel
 from ...core.state import create_initial_state
 from ...core.config import settings
 from ...core.models import HypothesisType, HypothesisStatus
+from ...utils.hashing import content_digest, content_hash64
 from ..websocket import (
     emit_phase_change, emit_observation, emit_hypothesis_created,
     emit_confidence_change, emit_critic_review, emit_probe_result, emit_error
@@ -33,13 +34,22 @@ session_phases: dict[str, str] = {}
 def compute_page_hash(url: str, elements: list, title: str = "") -> str:
     """Compute a hash of the current page state for FSM tracking."""
     # Create a normalized representation
-    element_sigs = []
-    for el in elements[:50]:  # Limit for performance
-        sig = f"{el.get('tag', '')}-{el.get('id', '')}-{el.get('text', '')[:20]}"
-        element_sigs.append(sig)
-    
-    state_str = f"{url}|{title}|{'|'.join(sorted(element_sigs))}"
-    return hashlib.md5(state_str.encode()).hexdigest()[:16]
+    element_sigs = tuple(
+        f"{el.get('tag', '')}-{el.get('id', '')}-{el.get('text', '')[:20]}"
+        for el in elements[:50]  # Limit for performance
+    )
+    return _page_state_hash(url, title, element_sigs)
+
+
+@lru_cache(maxsize=256)
+def _page_state_hash(url: str, title: str, element_sigs: tuple[str, ...]) -> str:
+    """Hash a normalized page state; steady-state pages hit the cache."""
+    # Order-insensitive element hash: sum per-element hashes instead of sorting
+    # (a sum, not XOR, so repeated identical elements don't cancel out)
+    elements_hash = sum(map(content_hash64, element_sigs)) & 0xFFFFFFFFFFFFFFFF
+    state_str = f"{url}|{title}|{elements_hash:016x}"
+    # Non-cryptographic fingerprint (XXH3 when available)
+    return content_digest(state_str).hex()[:16]
 
 
 def is_duplicate_hypothesis(new_hypo: dict, existing: list) -> bool:
@@ -15,7 +15,7 @@ from .models import (
     CriticEvaluation,
     ActionRecord,
 )
-from .guardrails import Guardrails
+from .guardrails import Guardrails, TokenBucket
 
 __all__ = [
     "settings",
@@ -32,4 +32,5 @@ __all__ = [
     "CriticEvaluation",
     "ActionRecord",
     "Guardrails",
+    "TokenBucket",
 ]
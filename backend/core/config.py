@@ -67,6 +67,10 @@ class Settings(BaseSettings):
         default=1000,
         description="Maximum scientific loop iterations"
     )
+    llm_max_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent LLM calls per agent"
+    )
     confidence_threshold: float = Field(
         default=0.7,
         description="Minimum confidence for hypothesis export"
@@ -3,7 +3,9 @@ Ethics, Scope & Safety Guardrails.
 Enforces authorized-use-only constraints and professional responsibility.
 """
 
+import asyncio
 import re
+import time
 from urllib.parse import urlparse
 from typing import Literal
 from pydantic import BaseModel, Field
@@ -22,6 +24,41 @@ class RateLimitState(BaseModel):
     total_requests: int = 0
 
 
+class TokenBucket:
+    """
+    Async token-bucket limiter: paces requests to a steady rate while
+    letting bursts up to `capacity` through immediately.
+    """
+    
+    def __init__(self, capacity: int, refill_rate: float):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            capacity: Maximum burst size (tokens)
+            refill_rate: Tokens added per second
+        """
+        self.capacity = float(capacity)
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+                self.tokens = 1.0
+                self.last_refill = time.monotonic()
+            
+            self.tokens -= 1
+
+
 class Guardrails:
     """
     Safety and ethics enforcement for the Black-Box Web Intelligence system.
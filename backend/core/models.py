@@ -3,10 +3,11 @@ Pydantic models for the Black-Box Web Intelligence system.
 Defines all data structures for hypotheses, observations, probes, and agent communication.
 """
 
+import sys
 from datetime import datetime
 from enum import Enum
 from typing import Literal, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from uuid import uuid4
 
 
@@ -145,6 +146,18 @@ class NetworkObservation(BaseModel):
     # Context
     ui_action: ActionRecord | None = None
     page_url: str = ""
+    
+    @field_validator("method", "page_url")
+    @classmethod
+    def _intern_text(cls, value: str) -> str:
+        """Share one copy of low-cardinality strings across observations."""
+        return sys.intern(value)
+    
+    @field_validator("request_headers", "response_headers")
+    @classmethod
+    def _intern_header_names(cls, headers: dict[str, str]) -> dict[str, str]:
+        """Share header-name strings; values stay per-observation."""
+        return {sys.intern(name): value for name, value in headers.items()}
 
 
 class FrontierItem(BaseModel):
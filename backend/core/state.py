@@ -41,6 +41,10 @@ class AgentState(TypedDict):
     critic_reviews: list[dict[str, Any]]
     probe_results: list[dict[str, Any]]
     
+    # Routing flags summarizing critic_reviews (set by the critic)
+    probes_pending: bool
+    exploration_pending: bool
+    
     # Exploration gaps identified by agents
     exploration_gaps: list[str]
     
@@ -65,6 +69,8 @@ def create_initial_state(session_id: str, target_url: str) -> AgentState:
         pending_hypotheses=[],
         critic_reviews=[],
         probe_results=[],
+        probes_pending=False,
+        exploration_pending=False,
         exploration_gaps=[],
         should_continue=True,
         termination_reason=None,
@@ -16,6 +16,13 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
 
 
+# Tool used to force schema-shaped output in invoke_with_structured_output
+STRUCTURED_OUTPUT_TOOL = "structured_output"
+
+# Prompt-cache breakpoint for prefixes reused verbatim across calls
+PROMPT_CACHE_CONTROL = {"type": "ephemeral"}
+
+
 class AnthropicClient(LLMProvider):
     """
     Anthropic Claude client implementing LLMProvider interface.
@@ -43,6 +50,9 @@ class AnthropicClient(LLMProvider):
             raise ValueError("Anthropic API key not configured")
         
         self.client = AsyncAnthropic(api_key=self.api_key)
+        
+        # Last (tools, formatted) pair; tool lists are module constants
+        self._formatted_tools: tuple[list, list] | None = None
     
     @property
     def model_name(self) -> str:
@@ -56,6 +66,7 @@ class AnthropicClient(LLMProvider):
         max_tokens: int = 4096,
         tools: list[dict[str, Any]] | None = None,
         tool_choice: str | None = None,
+        cache_prefix: bool = False,
     ) -> LLMResponse:
         """
         Invoke Anthropic API.
@@ -67,6 +78,7 @@ class AnthropicClient(LLMProvider):
             max_tokens: Maximum tokens
             tools: Optional tool definitions
             tool_choice: Optional tool choice
+            cache_prefix: Mark tools + system prompt as a cacheable prefix
             
         Returns:
             LLM response
@@ -99,10 +111,25 @@ class AnthropicClient(LLMProvider):
         }
         
         if system_prompt:
-            kwargs["system"] = system_prompt
+            if cache_prefix:
+                kwargs["system"] = [{
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": PROMPT_CACHE_CONTROL
+                }]
+            else:
+                kwargs["system"] = system_prompt
         
         if tools:
-            kwargs["tools"] = self._format_tools(tools)
+            formatted = self._format_tools(tools)
+            if cache_prefix:
+                # Breakpoint on the last tool caches the whole tool block
+                # (copied so the memoized tool list stays unmarked)
+                formatted = [
+                    *formatted[:-1],
+                    {**formatted[-1], "cache_control": PROMPT_CACHE_CONTROL}
+                ]
+            kwargs["tools"] = formatted
             if tool_choice:
                 kwargs["tool_choice"] = {"type": tool_choice}
         
@@ -146,6 +173,8 @@ class AnthropicClient(LLMProvider):
     ) -> dict[str, Any]:
         """
         Invoke with structured JSON output.
+        The schema is enforced by forcing a single tool call whose input
+        schema is the output schema; text parsing is only a fallback.
         
         Args:
             messages: Messages or single user message
@@ -181,18 +210,26 @@ class AnthropicClient(LLMProvider):
                         "content": msg.content
                     })
         
-        # Make API call
+        # Make API call, forcing the structured-output tool
         response = await self.client.messages.create(
             model=self._model,
             system=schema_instruction.strip(),
             messages=api_messages,
             max_tokens=4096,
             temperature=temperature,
+            tools=[{
+                "name": STRUCTURED_OUTPUT_TOOL,
+                "description": "Return the response as structured JSON.",
+                "input_schema": output_schema
+            }],
+            tool_choice={"type": "tool", "name": STRUCTURED_OUTPUT_TOOL},
         )
         
-        # Extract content
+        # Tool input is already schema-shaped JSON
         content = ""
         for block in response.content:
+            if block.type == "tool_use" and block.name == STRUCTURED_OUTPUT_TOOL:
+                return block.input
             if block.type == "text":
                 content += block.text
         
@@ -223,8 +260,12 @@ class AnthropicClient(LLMProvider):
             tools: Tool definitions
             
         Returns:
-            Anthropic-formatted tools
+            Anthropic-formatted tools (memoized for the same list object)
         """
+        cached = self._formatted_tools
+        if cached is not None and cached[0] is tools:
+            return cached[1]
+        
         formatted = []
         for tool in tools:
             formatted.append({
@@ -232,4 +273,5 @@ class AnthropicClient(LLMProvider):
                 "description": tool.get("description", ""),
                 "input_schema": tool.get("parameters", {"type": "object", "properties": {}})
             })
+        self._formatted_tools = (tools, formatted)
         return formatted
@@ -10,12 +10,34 @@ from .provider import LLMProvider, LLMMessage, LLMResponse
 from ..core.config import settings
 
 try:
-    from openai import AsyncOpenAI
+    from openai import AsyncOpenAI, BadRequestError
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
 
 
+# Markers of a 400 caused by the json_schema response_format itself
+_RESPONSE_FORMAT_MARKERS = ("response_format", "json_schema")
+
+
+def _is_response_format_error(error: Exception) -> bool:
+    """
+    Check whether a bad-request error rejects the response_format.
+    
+    Args:
+        error: BadRequestError raised by the API
+        
+    Returns:
+        True if the model does not support json_schema output
+    """
+    param = getattr(error, "param", None) or ""
+    message = str(getattr(error, "message", "") or error)
+    return any(
+        marker in param or marker in message
+        for marker in _RESPONSE_FORMAT_MARKERS
+    )
+
+
 class OpenAIClient(LLMProvider):
     """
     OpenAI GPT client implementing LLMProvider interface.
@@ -43,6 +65,12 @@ class OpenAIClient(LLMProvider):
             raise ValueError("OpenAI API key not configured")
         
         self.client = AsyncOpenAI(api_key=self.api_key)
+        
+        # Flipped off if the model rejects json_schema response_format
+        self._json_schema_supported = True
+        
+        # Last (tools, formatted) pair; tool lists are module constants
+        self._formatted_tools: tuple[list, list] | None = None
     
     @property
     def model_name(self) -> str:
@@ -56,6 +84,7 @@ class OpenAIClient(LLMProvider):
         max_tokens: int = 4096,
         tools: list[dict[str, Any]] | None = None,
         tool_choice: str | None = None,
+        cache_prefix: bool = False,
     ) -> LLMResponse:
         """
         Invoke OpenAI API.
@@ -67,6 +96,8 @@ class OpenAIClient(LLMProvider):
             max_tokens: Maximum tokens
             tools: Optional tool definitions
             tool_choice: Optional tool choice
+            cache_prefix: Accepted for interface parity; OpenAI caches
+                repeated prompt prefixes automatically
             
         Returns:
             LLM response
@@ -148,6 +179,8 @@ class OpenAIClient(LLMProvider):
     ) -> dict[str, Any]:
         """
         Invoke with structured JSON output using response_format.
+        Uses json_schema (schema-constrained decoding) when the model
+        supports it, otherwise json_object mode.
         
         Args:
             messages: Messages or single user message
@@ -186,13 +219,38 @@ class OpenAIClient(LLMProvider):
                     "content": msg.content
                 })
         
-        # Make API call with JSON mode
-        response = await self.client.chat.completions.create(
-            model=self._model,
-            messages=api_messages,
-            temperature=temperature,
-            response_format={"type": "json_object"}
-        )
+        # Prefer schema-constrained decoding; fall back to plain JSON mode
+        # for models that don't support json_schema response_format
+        response = None
+        if self._json_schema_supported:
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self._model,
+                    messages=api_messages,
+                    temperature=temperature,
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "structured_output",
+                            "schema": output_schema,
+                            "strict": False
+                        }
+                    }
+                )
+            except BadRequestError as e:
+                # Only a rejected response_format means the model lacks support;
+                # context overflows and other bad requests are real errors
+                if not _is_response_format_error(e):
+                    raise
+                self._json_schema_supported = False
+        
+        if response is None:
+            response = await self.client.chat.completions.create(
+                model=self._model,
+                messages=api_messages,
+                temperature=temperature,
+                response_format={"type": "json_object"}
+            )
         
         content = response.choices[0].message.content or "{}"
         
@@ -215,8 +273,12 @@ class OpenAIClient(LLMProvider):
             tools: Tool definitions
             
         Returns:
-            OpenAI-formatted tools
+            OpenAI-formatted tools (memoized for the same list object)
         """
+        cached = self._formatted_tools
+        if cached is not None and cached[0] is tools:
+            return cached[1]
+        
         formatted = []
         for tool in tools:
             formatted.append({
@@ -227,4 +289,5 @@ class OpenAIClient(LLMProvider):
                     "parameters": tool.get("parameters", {"type": "object", "properties": {}})
                 }
             })
+        self._formatted_tools = (tools, formatted)
         return formatted
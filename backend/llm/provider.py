@@ -40,6 +40,7 @@ class LLMProvider(ABC):
         max_tokens: int = 4096,
         tools: list[dict[str, Any]] | None = None,
         tool_choice: str | None = None,
+        cache_prefix: bool = False,
     ) -> LLMResponse:
         """
         Invoke the LLM with messages.
@@ -51,6 +52,8 @@ class LLMProvider(ABC):
             max_tokens: Maximum tokens in response
             tools: Optional list of tool definitions
             tool_choice: Optional tool choice setting
+            cache_prefix: Hint that system prompt + tools are reused verbatim
+                across calls and should be cached provider-side
             
         Returns:
             LLM response
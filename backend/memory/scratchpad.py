@@ -9,6 +9,12 @@ from pydantic import BaseModel, Field
 from uuid import uuid4
 
 
+# Navigator exploration memo bounds (keeps prompt size flat over long runs)
+MEMO_MAX_LINES = 20
+MEMO_LINE_LIMIT = 120
+MEMO_ERROR_LIMIT = 200
+
+
 class FailedAttempt(BaseModel):
     """Record of a failed action attempt."""
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -43,11 +49,15 @@ class AgentScratchpad(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     last_updated: datetime = Field(default_factory=datetime.now)
     
+    # Bumped whenever recent actions or failures change (for render caches)
+    revision: int = 0
+    
     def add_action(self, action: dict[str, Any], max_history: int = 10):
         """Add an action to recent history, maintaining max size."""
         self.recent_actions.append(action)
         if len(self.recent_actions) > max_history:
             self.recent_actions = self.recent_actions[-max_history:]
+        self.revision += 1
         self.last_updated = datetime.now()
     
     def add_observation_id(self, obs_id: str, max_history: int = 10):
@@ -69,6 +79,7 @@ class AgentScratchpad(BaseModel):
             target=target,
             error=error
         ))
+        self.revision += 1
         self.last_updated = datetime.now()
     
     def clear(self):
@@ -78,6 +89,7 @@ class AgentScratchpad(BaseModel):
         self.recent_observation_ids = []
         self.draft_hypotheses = []
         self.failed_attempts = []
+        self.revision += 1
         self.last_updated = datetime.now()
 
 
@@ -103,6 +115,45 @@ class NavigatorScratchpad(AgentScratchpad):
     # Pending form data to try
     pending_form_inputs: list[dict[str, Any]] = Field(default_factory=list)
     
+    # Compressed exploration memo: one capped line per attempt (FIFO) and
+    # the most recent failure; this, not raw action history, goes in prompts
+    attempts_log: list[str] = Field(default_factory=list)
+    current_error_pattern: str = ""
+    
+    def add_action(self, action: dict[str, Any], max_history: int = 10):
+        """Add an action to recent history and a one-line memo entry."""
+        line = f"{action.get('tool', 'unknown')}: {action.get('result', 'no result')}"
+        self.attempts_log.append(line[:MEMO_LINE_LIMIT])
+        if len(self.attempts_log) > MEMO_MAX_LINES:
+            del self.attempts_log[:-MEMO_MAX_LINES]
+        super().add_action(action, max_history)
+    
+    def record_failure(self, action_type: str, target: str, error: str):
+        """Record a failed attempt and refresh the memo's error pattern."""
+        self.current_error_pattern = f"{action_type} on {target}: {error}"[:MEMO_ERROR_LIMIT]
+        super().record_failure(action_type, target, error)
+    
+    def clear(self):
+        """Clear all temporary data, including the exploration memo."""
+        self.attempts_log = []
+        self.current_error_pattern = ""
+        super().clear()
+    
+    def render_memo(self) -> str:
+        """
+        Format the exploration memo for a prompt.
+        
+        Returns:
+            Attempts log lines plus the current error pattern, if any
+        """
+        if not self.attempts_log:
+            lines = ["  (none yet)"]
+        else:
+            lines = [f"  - {line}" for line in self.attempts_log]
+        if self.current_error_pattern:
+            lines.append(f"  Current error pattern: {self.current_error_pattern}")
+        return "\n".join(lines)
+    
     def push_backtrack(self, state_hash: str):
         """Push a state to backtrack stack."""
         self.backtrack_stack.append(state_hash)
@@ -1,10 +1,16 @@
 """Utilities module - hashing, OpenAPI builder, and helpers."""
 
-from .hashing import compute_simhash, hamming_distance
+from .hashing import compute_simhash, content_digest, content_hash64, hamming_distance
+from .json_codec import json_loads, json_dumps, parse_json_body
 from .openapi_builder import OpenAPIBuilder
 
 __all__ = [
     "compute_simhash",
+    "content_digest",
+    "content_hash64",
     "hamming_distance",
+    "json_loads",
+    "json_dumps",
+    "parse_json_body",
     "OpenAPIBuilder",
 ]
@@ -11,6 +11,47 @@ try:
 except ImportError:
     SIMHASH_AVAILABLE = False
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+def content_digest(text: str) -> bytes:
+    """
+    Fast, run-stable 16-byte fingerprint of a (possibly large) string.
+    Uses XXH3-128 when available, otherwise BLAKE2b.
+    
+    Args:
+        text: Content to fingerprint (e.g. a DOM snapshot)
+        
+    Returns:
+        16-byte digest
+    """
+    data = text.encode("utf-8", "surrogatepass")
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def content_hash64(text: str) -> int:
+    """
+    Fast, run-stable 64-bit hash of a short string. Unlike the built-in
+    hash(), the value does not change between processes.
+    Uses XXH3-64 when available, otherwise BLAKE2b.
+    
+    Args:
+        text: Content to hash
+        
+    Returns:
+        Unsigned 64-bit integer
+    """
+    data = text.encode("utf-8", "surrogatepass")
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
 
 def compute_simhash(data: str | list[str] | dict[str, Any]) -> str:
     """
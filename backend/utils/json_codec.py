@@ -0,0 +1,79 @@
+"""
+JSON Codec - orjson-backed encode/decode with a stdlib fallback.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Raised by json_loads on malformed input (orjson's error subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_loads(data: str | bytes) -> Any:
+    """
+    Decode a JSON document.
+    
+    Args:
+        data: JSON text or UTF-8 bytes
+        
+    Returns:
+        Decoded Python object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Encode an object as JSON text.
+    
+    Args:
+        obj: JSON-serializable object
+        indent: Pretty-print with two-space indentation
+        sort_keys: Emit object keys in sorted order (stable fingerprints)
+        
+    Returns:
+        JSON string, compact unless indent is set
+    """
+    if ORJSON_AVAILABLE:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            # orjson is stricter (e.g. non-str keys); fall back to stdlib
+            pass
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys)
+
+
+def parse_json_body(body: Any) -> Any:
+    """
+    Parse a captured request/response body as JSON.
+    
+    Args:
+        body: Raw body (JSON text/bytes or already-decoded data)
+        
+    Returns:
+        Decoded data, or None if the body is empty or not JSON
+    """
+    if not body:
+        return None
+    if not isinstance(body, (str, bytes, bytearray)):
+        return body
+    try:
+        return json_loads(body)
+    except JSONDecodeError:
+        return None